@@ -0,0 +1,242 @@
+import struct
+from collections.abc import Iterable
+from typing import BinaryIO, TextIO
+
+from bitio import iter_chunks
+from huffman_codes import assign_canonical_codes, huffman_code_lengths
+
+
+# Через сколько символов модель перестраивается в установившемся режиме
+DEFAULT_REBUILD_INTERVAL = 1 << 12
+# С какого интервала модель начинает перестраиваться в начале потока
+FIRST_REBUILD_INTERVAL = 16
+# При такой сумме частот они делятся пополам, чтобы модель следовала за текстом
+MAX_TOTAL_FREQUENCY = 1 << 16
+# Сколько бит декодер просматривает за одно обращение к таблице
+LOOKUP_BITS = 10
+
+# Служебный символ модели: за ним идёт код символа Юникода
+ESCAPE = ""
+CODEPOINT_BITS = 21
+# Код после ESCAPE, означающий конец потока (вне диапазона Юникода)
+END_CODEPOINT = (1 << CODEPOINT_BITS) - 1
+
+# Заголовок потока: интервал перестройки модели
+_HEADER = struct.Struct(">I")
+
+
+class _AdaptiveModel:
+    """
+    Периодически перестраиваемая модель Хаффмана, общая для кодировщика и декодера.
+
+    Частоты копятся по мере кодирования, канонические коды пересчитываются
+    сразу после появления нового символа и через интервал, который удваивается
+    от FIRST_REBUILD_INTERVAL до rebuild_interval, чтобы модель быстро
+    сходилась в начале потока. Символы, которых ещё нет в таблице,
+    передаются через ESCAPE и свой код Юникода. Обе стороны обновляют модель
+    одинаково, поэтому остаются синхронными без передачи таблиц.
+    """
+
+    def __init__(self, rebuild_interval: int):
+        self.rebuild_interval = rebuild_interval
+        self.current_interval = min(FIRST_REBUILD_INTERVAL, rebuild_interval)
+        self.counts: dict[str, int] = {ESCAPE: 1}
+        self.since_rebuild = 0
+        self.rebuild()
+
+    def update(self, char: str) -> None:
+        count = self.counts.get(char, 0)
+        self.counts[char] = count + 1
+        self.since_rebuild += 1
+        if not count:
+            self.rebuild()
+        elif self.since_rebuild >= self.current_interval:
+            self.current_interval = min(2 * self.current_interval, self.rebuild_interval)
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        if sum(self.counts.values()) >= MAX_TOTAL_FREQUENCY:
+            self.counts = {char: (count + 1) // 2 for char, count in self.counts.items()}
+        self.since_rebuild = 0
+        self.codes = assign_canonical_codes(huffman_code_lengths(self.counts))
+
+        # Таблицы декодера: окно LOOKUP_BITS бит -> (символ, длина) и канонические таблицы
+        self.max_length = max(length for _, length in self.codes.values())
+        self.lookup_bits = min(LOOKUP_BITS, self.max_length)
+        size = 1 << self.lookup_bits
+        self.lookup_chars: list[str | None] = [None] * size
+        self.lookup_lengths = [0] * size
+        self.length_counts = [0] * (self.max_length + 1)
+        for char, (code, length) in self.codes.items():
+            self.length_counts[length] += 1
+            if length <= self.lookup_bits:
+                first = code << (self.lookup_bits - length)
+                for window in range(first, first + (1 << (self.lookup_bits - length))):
+                    self.lookup_chars[window] = char
+                    self.lookup_lengths[window] = length
+        self.sorted_chars = sorted(self.codes, key=lambda char: (self.codes[char][1], char))
+
+
+class AdaptiveHuffmanEncoder:
+    """
+    Однопроходный кодировщик Хаффмана без предварительного подсчёта частот.
+
+    encode возвращает все целые байты, готовые после очередного куска,
+    поэтому задержка ограничена одним куском.
+    """
+
+    def __init__(self, rebuild_interval: int = DEFAULT_REBUILD_INTERVAL):
+        self._model = _AdaptiveModel(rebuild_interval)
+        self._acc = 0       # Накопитель ещё не отданных бит
+        self._acc_bits = 0
+        self._header = _HEADER.pack(rebuild_interval)
+
+    def encode(self, chunk: str) -> bytes:
+        model = self._model
+        acc = self._acc
+        acc_bits = self._acc_bits
+        out = bytearray(self._header)
+        self._header = b""
+        for char in chunk:
+            entry = model.codes.get(char)
+            if entry is None:
+                code, length = model.codes[ESCAPE]
+                acc = (((acc << length) | code) << CODEPOINT_BITS) | ord(char)
+                acc_bits += length + CODEPOINT_BITS
+            else:
+                code, length = entry
+                acc = (acc << length) | code
+                acc_bits += length
+            model.update(char)
+            # Отдаём по 64 бита, чтобы накопитель не рос
+            if acc_bits >= 64:
+                acc_bits -= 64
+                out += (acc >> acc_bits).to_bytes(8, "big")
+                acc &= (1 << acc_bits) - 1
+
+        self._acc, self._acc_bits = acc, acc_bits
+        return bytes(out + self._take_bytes())
+
+    def finish(self) -> bytes:
+        """Пишем маркер конца потока и дополняем последний байт нулями."""
+        code, length = self._model.codes[ESCAPE]
+        self._acc = (((self._acc << length) | code) << CODEPOINT_BITS) | END_CODEPOINT
+        self._acc_bits += length + CODEPOINT_BITS
+        padding = -self._acc_bits % 8
+        self._acc <<= padding
+        self._acc_bits += padding
+        return self._header + self._take_bytes()
+
+    def _take_bytes(self) -> bytes:
+        """Забираем из накопителя все целые байты."""
+        nbytes = self._acc_bits // 8
+        self._acc_bits -= nbytes * 8
+        data = (self._acc >> self._acc_bits).to_bytes(nbytes, "big")
+        self._acc &= (1 << self._acc_bits) - 1
+        return data
+
+
+class AdaptiveHuffmanDecoder:
+    """
+    Однопроходный декодер к AdaptiveHuffmanEncoder.
+
+    Байты можно подавать частями: decode возвращает всё, что удалось
+    декодировать, а незаконченный код ждёт следующей порции.
+    """
+
+    def __init__(self):
+        self._model: _AdaptiveModel | None = None
+        self._buffer = b""  # Пришедшие, но ещё не загруженные в накопитель байты
+        self._offset = 0
+        self._acc = 0
+        self._acc_bits = 0
+        self.finished = False
+
+    def decode(self, data: bytes) -> str:
+        if self.finished:
+            return ""
+        self._buffer = self._buffer[self._offset:] + data
+        self._offset = 0
+        if self._model is None:
+            if len(self._buffer) < _HEADER.size:
+                return ""
+            (rebuild_interval,) = _HEADER.unpack_from(self._buffer)
+            self._model = _AdaptiveModel(rebuild_interval)
+            self._offset = _HEADER.size
+
+        model = self._model
+        decoded = []
+        while True:
+            # Держим в накопителе достаточно бит для самого длинного кода с ESCAPE
+            while self._acc_bits < model.max_length + CODEPOINT_BITS and self._offset < len(self._buffer):
+                portion = self._buffer[self._offset:self._offset + 8]
+                self._acc = (self._acc << (8 * len(portion))) | int.from_bytes(portion, "big")
+                self._acc_bits += 8 * len(portion)
+                self._offset += len(portion)
+
+            char, length = self._peek_symbol()
+            if char is None:
+                break
+            if char == ESCAPE:
+                if self._acc_bits < length + CODEPOINT_BITS:
+                    break
+                self._acc_bits -= length + CODEPOINT_BITS
+                codepoint = (self._acc >> self._acc_bits) & END_CODEPOINT
+                if codepoint == END_CODEPOINT:
+                    self.finished = True
+                    break
+                char = chr(codepoint)
+            else:
+                self._acc_bits -= length
+            self._acc &= (1 << self._acc_bits) - 1
+            decoded.append(char)
+            model.update(char)
+
+        return "".join(decoded)
+
+    def _peek_symbol(self) -> tuple[str | None, int]:
+        """Определяем следующий символ и длину его кода, не сдвигая позицию."""
+        model = self._model
+        acc, acc_bits = self._acc, self._acc_bits
+        if acc_bits >= model.lookup_bits:
+            window = (acc >> (acc_bits - model.lookup_bits)) & ((1 << model.lookup_bits) - 1)
+            length = model.lookup_lengths[window]
+            if length:
+                return model.lookup_chars[window], length
+
+        # Побитовое каноническое декодирование для длинных кодов и конца данных
+        code = 0
+        first = 0
+        index = 0
+        for length in range(1, min(model.max_length, acc_bits) + 1):
+            code |= (acc >> (acc_bits - length)) & 1
+            count = model.length_counts[length]
+            if code - first < count:
+                return model.sorted_chars[index + code - first], length
+            index += count
+            first = (first + count) << 1
+            code <<= 1
+        return None, 0
+
+
+def adaptive_huffman_encode_stream(
+    source: Iterable[str] | TextIO,
+    sink: BinaryIO,
+    rebuild_interval: int = DEFAULT_REBUILD_INTERVAL,
+) -> int:
+    """Кодируем текст за один проход, возвращаем количество записанных байт."""
+    encoder = AdaptiveHuffmanEncoder(rebuild_interval)
+    written = 0
+    for chunk in iter_chunks(source):
+        written += sink.write(encoder.encode(chunk))
+    written += sink.write(encoder.finish())
+    return written
+
+
+def adaptive_huffman_decode(data: bytes) -> str:
+    """Декодируем байты, записанные adaptive_huffman_encode_stream."""
+    decoder = AdaptiveHuffmanDecoder()
+    text = decoder.decode(data)
+    if not decoder.finished:
+        raise ValueError("Поток обрывается без маркера конца")
+    return text
@@ -0,0 +1,194 @@
+import io
+import json
+import os
+import struct
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import BinaryIO
+
+from adaptive_huffman import adaptive_huffman_decode, adaptive_huffman_encode_stream
+from context_model import context_decode, context_encode_stream
+from entropy import context_entropies
+from frequencies import count_char_ngrams
+from huffman_codes import (
+    HuffmanDecoder,
+    build_code_table,
+    huffman_code_lengths,
+    huffman_encode_stream,
+    write_huffman_header,
+)
+from lwz import lzw_decode, lzw_encode_stream
+
+
+# Число значащих бит перед потоком Хаффмана
+_BITS = struct.Struct(">Q")
+
+
+def _huffman_encoder(max_length: int | None) -> Callable[[str, BinaryIO], None]:
+    def encode(path: str, sink: BinaryIO) -> None:
+        freq_dict = count_char_ngrams(path, 1)
+        payload = io.BytesIO()
+        with open(path, encoding="utf-8", newline="") as source:
+            total_bits = huffman_encode_stream(source, build_code_table(freq_dict, max_length), payload)
+        sink.write(write_huffman_header(huffman_code_lengths(freq_dict, max_length)))
+        sink.write(_BITS.pack(total_bits))
+        sink.write(payload.getbuffer())
+
+    return encode
+
+
+def _huffman_decode(data: bytes) -> str:
+    decoder, offset = HuffmanDecoder.from_header(data)
+    (total_bits,) = _BITS.unpack_from(data, offset)
+    return decoder.decode(memoryview(data)[offset + _BITS.size:], total_bits)
+
+
+def _lzw_encoder(max_code_width: int) -> Callable[[str, BinaryIO], None]:
+    def encode(path: str, sink: BinaryIO) -> None:
+        alphabet = sorted(count_char_ngrams(path, 1))
+        with open(path, encoding="utf-8", newline="") as source:
+            lzw_encode_stream(source, alphabet, sink, max_code_width)
+
+    return encode
+
+
+def _adaptive_huffman_encode(path: str, sink: BinaryIO) -> None:
+    with open(path, encoding="utf-8", newline="") as source:
+        adaptive_huffman_encode_stream(source, sink)
+
+
+def _context_encoder(order: int) -> Callable[[str, BinaryIO], None]:
+    def encode(path: str, sink: BinaryIO) -> None:
+        with open(path, encoding="utf-8", newline="") as source:
+            context_encode_stream(source, sink, order)
+
+    return encode
+
+
+# Кодеки бенчмарка: название -> (кодирование файла в поток, декодирование байт в текст)
+CODECS: dict[str, tuple[Callable[[str, BinaryIO], None], Callable[[bytes], str]]] = {
+    "huffman": (_huffman_encoder(None), _huffman_decode),
+    "huffman-max12": (_huffman_encoder(12), _huffman_decode),
+    "adaptive-huffman": (_adaptive_huffman_encode, adaptive_huffman_decode),
+    "lzw-12": (_lzw_encoder(12), lzw_decode),
+    "lzw-16": (_lzw_encoder(16), lzw_decode),
+    "context-order1": (_context_encoder(1), context_decode),
+    "context-order2": (_context_encoder(2), context_decode),
+}
+
+
+def benchmark_file(path: str, codecs: list[str], measure_memory: bool = True) -> dict:
+    """
+    Замеряем все кодеки на одном файле.
+
+    Для каждого кодека: размер сжатого файла, отставание от границ Шеннона
+    по условной энтропии порядков 0..2 (context_entropies), скорость кодирования
+    и декодирования, пиковая память (tracemalloc, отдельным прогоном,
+    чтобы не искажать скорость) и совпадение декодированного текста с исходным.
+    """
+    with open(path, encoding="utf-8", newline="") as fp:
+        text = fp.read()
+    size_mb = os.path.getsize(path) / 1e6
+    n = len(text)
+
+    # Граница порядка k: первые k символов кодируются с более коротким контекстом,
+    # остальные — при известных k предыдущих
+    entropies = context_entropies(path)
+    bounds = [
+        sum(entropies[:min(order, n)]) + max(n - order, 0) * entropies[order]
+        for order in range(len(entropies))
+    ]
+
+    result = {
+        "file": path,
+        "chars": n,
+        "bytes": os.path.getsize(path),
+        **{f"entropy_order{order}": entropy for order, entropy in enumerate(entropies)},
+        **{f"shannon_bits_order{order}": bound for order, bound in enumerate(bounds)},
+        "codecs": {},
+    }
+
+    for name in codecs:
+        encode, decode = CODECS[name]
+
+        sink = io.BytesIO()
+        start = time.perf_counter()
+        encode(path, sink)
+        encode_seconds = time.perf_counter() - start
+        data = sink.getvalue()
+
+        start = time.perf_counter()
+        decoded = decode(data)
+        decode_seconds = time.perf_counter() - start
+
+        compressed_bits = len(data) * 8
+        codec_result = {
+            "compressed_bytes": len(data),
+            "bits_per_char": compressed_bits / n if n else 0.0,
+            **{f"gap_order{order}_bits": compressed_bits - bound for order, bound in enumerate(bounds)},
+            **{
+                f"gap_order{order}_ratio": compressed_bits / bound - 1 if bound else None
+                for order, bound in enumerate(bounds)
+            },
+            "encode_mb_s": size_mb / encode_seconds if encode_seconds else None,
+            "decode_mb_s": size_mb / decode_seconds if decode_seconds else None,
+            "roundtrip_ok": decoded == text,
+        }
+
+        if measure_memory:
+            codec_result["encode_peak_bytes"] = _peak_memory(lambda: encode(path, io.BytesIO()))
+            codec_result["decode_peak_bytes"] = _peak_memory(lambda: decode(data))
+
+        result["codecs"][name] = codec_result
+
+    return result
+
+
+def benchmark_corpus(corpus_dir: str, codecs: list[str] | None = None, measure_memory: bool = True) -> dict:
+    """
+    Замеряем кодеки на всех файлах каталога (по алфавиту).
+
+    Пустые файлы не замеряются (сжимать нечего, а скорость и отставание от
+    энтропии для них не определены) и перечисляются в отчёте отдельно.
+    """
+    codecs = codecs or list(CODECS)
+    paths = sorted(
+        os.path.join(corpus_dir, name)
+        for name in os.listdir(corpus_dir)
+        if os.path.isfile(os.path.join(corpus_dir, name))
+    )
+    return {
+        "corpus": corpus_dir,
+        "codecs": codecs,
+        "files": [benchmark_file(path, codecs, measure_memory) for path in paths if os.path.getsize(path)],
+        "empty_files": [path for path in paths if not os.path.getsize(path)],
+    }
+
+
+def _peak_memory(action: Callable[[], object]) -> int:
+    """Пиковый объём памяти, выделенной Python во время action."""
+    tracemalloc.start()
+    try:
+        action()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    corpus_dir = sys.argv[1] if len(sys.argv) > 1 else "corpus"
+    report = benchmark_corpus(corpus_dir)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w", encoding="utf-8", newline="") as fp:
+            fp.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO, TextIO
+
+
+# Размер куска, которым читается текстовый файл при потоковом кодировании
+STREAM_CHUNK_SIZE = 1 << 16
+# Сколько байт BitWriter копит перед записью в поток
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def iter_chunks(source: Iterable[str] | TextIO) -> Iterator[str]:
+    """Перебираем куски текста из итерируемого объекта или файла."""
+    if hasattr(source, "read"):
+        yield from iter(lambda: source.read(STREAM_CHUNK_SIZE), "")
+    else:
+        yield from source
+
+
+class BitWriter:
+    """Упаковываем коды произвольной ширины в байты старшим битом вперёд."""
+
+    def __init__(self, sink: BinaryIO):
+        self._sink = sink
+        self._acc = 0       # Накопитель ещё не записанных бит
+        self._acc_bits = 0  # Сколько бит лежит в накопителе
+        self._buffer = bytearray()
+        self.total_bits = 0
+
+    def write(self, code: int, width: int) -> None:
+        """Дописываем младшие width бит числа code."""
+        self._acc = (self._acc << width) | code
+        self._acc_bits += width
+        self.total_bits += width
+        while self._acc_bits >= 64:
+            self._acc_bits -= 64
+            self._buffer += (self._acc >> self._acc_bits).to_bytes(8, "big")
+            self._acc &= (1 << self._acc_bits) - 1
+        if len(self._buffer) >= WRITE_BUFFER_SIZE:
+            self._sink.write(self._buffer)
+            self._buffer = bytearray()
+
+    def flush(self) -> None:
+        """Записываем остаток, дополняя последний байт нулями."""
+        if self._acc_bits:
+            tail_bytes = (self._acc_bits + 7) // 8
+            self._buffer += (self._acc << (tail_bytes * 8 - self._acc_bits)).to_bytes(tail_bytes, "big")
+            self._acc = 0
+            self._acc_bits = 0
+        self._sink.write(self._buffer)
+        self._buffer = bytearray()
@@ -0,0 +1,206 @@
+import io
+import os
+import struct
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, NamedTuple, TextIO
+
+from frequencies import count_char_ngrams
+from huffman_codes import (
+    HuffmanDecoder,
+    assign_canonical_codes,
+    huffman_code_lengths,
+    huffman_encode_stream,
+    read_huffman_header,
+    write_huffman_header,
+)
+from lwz import DEFAULT_MAX_CODE_WIDTH, lzw_decode, lzw_encode_stream
+
+
+# Размер блока по умолчанию, в символах
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+CONTAINER_MAGIC = b"DMLB"
+CODECS = {"huffman": 0, "lzw": 1}
+
+# Заголовок контейнера: магия, кодек, флаг общей таблицы, размер таблицы
+_HEADER = struct.Struct(">4sBBI")
+# Запись индекса: смещение блока, размер в байтах, число символов
+_INDEX_ENTRY = struct.Struct(">QQQ")
+# Хвост файла: смещение индекса и число блоков
+_FOOTER = struct.Struct(">QI")
+# Число значащих бит в начале блока Хаффмана
+_BITS = struct.Struct(">Q")
+
+
+class BlockEntry(NamedTuple):
+    offset: int
+    size: int
+    chars: int
+
+
+class BlockContainer(NamedTuple):
+    codec: str
+    table: bytes  # Общий заголовок Хаффмана или b"", если таблицы у блоков свои
+    blocks: list[BlockEntry]
+
+
+def compress_file_blocks(
+    input_path: str,
+    output_path: str,
+    codec: str = "huffman",
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    shared_table: bool = True,
+    workers: int | None = None,
+) -> int:
+    """
+    Сжимаем текстовый файл независимыми блоками в нескольких процессах.
+
+    Вход читается без перевода строк (newline=""), как и при подсчёте частот
+    общей таблицы, так что "\r" и "\r\n" восстанавливаются байт в байт.
+    Вход режется на блоки по block_size символов, каждый блок сжимается отдельно:
+    Хаффман — общей для файла таблицей (shared_table, требует предварительного
+    подсчёта частот) или своей таблицей на блок, LZW — своим словарём на блок.
+    В конец файла пишется индекс блоков, поэтому распаковка тоже идёт
+    параллельно и может начинаться с любого блока.
+
+    Возвращает количество блоков.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Неизвестный кодек {codec!r}, доступны: {', '.join(CODECS)}")
+
+    shared_table = shared_table and codec == "huffman"
+    table = b""
+    if shared_table:
+        table = write_huffman_header(huffman_code_lengths(count_char_ngrams(input_path, 1)))
+
+    workers = workers or os.cpu_count() or 1
+    blocks = []
+    with open(input_path, encoding="utf-8", newline="") as source, open(output_path, "wb") as sink, \
+            ProcessPoolExecutor(workers) as executor:
+        sink.write(_HEADER.pack(CONTAINER_MAGIC, CODECS[codec], shared_table, len(table)))
+        sink.write(table)
+
+        texts = iter(lambda: source.read(block_size), "")
+        jobs = ((_compress_block, text, codec, table) for text in texts)
+        for chars, payload in _ordered_map(executor, jobs, 2 * workers):
+            blocks.append(BlockEntry(sink.tell(), len(payload), chars))
+            sink.write(payload)
+
+        index_offset = sink.tell()
+        for entry in blocks:
+            sink.write(_INDEX_ENTRY.pack(*entry))
+        sink.write(_FOOTER.pack(index_offset, len(blocks)))
+
+    return len(blocks)
+
+
+def decompress_file_blocks(input_path: str, sink: TextIO, workers: int | None = None) -> int:
+    """
+    Распаковываем контейнер compress_file_blocks, декодируя блоки параллельно.
+
+    Блоки пишутся в sink по порядку; файл для sink стоит открывать с newline="",
+    чтобы переводы строк не менялись. Возвращает количество символов.
+    """
+    workers = workers or os.cpu_count() or 1
+    with open(input_path, "rb") as source, ProcessPoolExecutor(workers) as executor:
+        container = read_block_index(source)
+        jobs = (
+            (_decompress_block, _read_payload(source, entry), container.codec, container.table)
+            for entry in container.blocks
+        )
+        total_chars = 0
+        for text in _ordered_map(executor, jobs, 2 * workers):
+            sink.write(text)
+            total_chars += len(text)
+
+    return total_chars
+
+
+def read_block(input_path: str, block_number: int) -> str:
+    """Распаковываем один блок контейнера, не трогая остальные."""
+    with open(input_path, "rb") as source:
+        container = read_block_index(source)
+        payload = _read_payload(source, container.blocks[block_number])
+    return _decompress_block(payload, container.codec, container.table)
+
+
+def read_block_index(source: BinaryIO) -> BlockContainer:
+    """Читаем заголовок и индекс блоков контейнера."""
+    source.seek(0)
+    magic, codec_id, shared_table, table_size = _HEADER.unpack(source.read(_HEADER.size))
+    if magic != CONTAINER_MAGIC:
+        raise ValueError("Файл не является контейнером блоков")
+    codec = next((name for name, value in CODECS.items() if value == codec_id), None)
+    if codec is None:
+        raise ValueError(f"Неизвестный кодек в контейнере: {codec_id}")
+    table = source.read(table_size) if shared_table else b""
+
+    source.seek(-_FOOTER.size, io.SEEK_END)
+    index_offset, block_count = _FOOTER.unpack(source.read(_FOOTER.size))
+    source.seek(index_offset)
+    index = source.read(_INDEX_ENTRY.size * block_count)
+    blocks = [BlockEntry(*entry) for entry in _INDEX_ENTRY.iter_unpack(index)]
+
+    return BlockContainer(codec, table, blocks)
+
+
+def _ordered_map(executor: Executor, jobs: Iterable[tuple], window: int) -> Iterator:
+    """
+    Выполняем задачи (функция, *аргументы) в executor и отдаём результаты по порядку.
+
+    В работе одновременно не больше window задач (по две на процесс),
+    поэтому память ограничена несколькими блоками независимо от размера входа.
+    """
+    pending: deque[Future] = deque()
+    for fn, *args in jobs:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _read_payload(source: BinaryIO, entry: BlockEntry) -> bytes:
+    source.seek(entry.offset)
+    return source.read(entry.size)
+
+
+def _compress_block(text: str, codec: str, table: bytes) -> tuple[int, bytes]:
+    """Сжимаем один блок; выполняется в процессе-обработчике."""
+    sink = io.BytesIO()
+    if codec == "lzw":
+        lzw_encode_stream([text], sorted(set(text)), sink, DEFAULT_MAX_CODE_WIDTH)
+        return len(text), sink.getvalue()
+
+    if table:
+        code_lengths, _ = read_huffman_header(table)
+    else:
+        code_lengths = huffman_code_lengths(Counter(text))
+        sink.write(write_huffman_header(code_lengths))
+    total_bits = huffman_encode_stream([text], assign_canonical_codes(code_lengths), sink)
+    return len(text), _BITS.pack(total_bits) + sink.getvalue()
+
+
+def _decompress_block(payload: bytes, codec: str, table: bytes) -> str:
+    """Распаковываем один блок; выполняется в процессе-обработчике."""
+    if codec == "lzw":
+        return lzw_decode(payload)
+
+    (total_bits,) = _BITS.unpack_from(payload)
+    data = memoryview(payload)[_BITS.size:]
+    if table:
+        decoder = _shared_decoder(table)
+    else:
+        decoder, header_size = HuffmanDecoder.from_header(data)
+        data = data[header_size:]
+    return decoder.decode(data, total_bits)
+
+
+@lru_cache(maxsize=8)
+def _shared_decoder(table: bytes) -> HuffmanDecoder:
+    """Общую таблицу достаточно разобрать один раз на процесс."""
+    decoder, _ = HuffmanDecoder.from_header(table)
+    return decoder
@@ -0,0 +1,164 @@
+import struct
+from collections.abc import Iterable
+from typing import BinaryIO, TextIO
+
+from bitio import iter_chunks
+from range_coder import MAX_TOTAL, RangeDecoder, RangeEncoder
+
+
+# Порядок контекста по умолчанию: вероятность символа при известных двух предыдущих
+DEFAULT_ORDER = 2
+
+CODEPOINT_BITS = 21
+# Код символа вне модели передаётся двумя частями: старшие и младшие биты
+_HIGH_BITS = 10
+_LOW_BITS = CODEPOINT_BITS - _HIGH_BITS
+# Код, означающий конец потока (вне диапазона Юникода)
+END_CODEPOINT = (1 << CODEPOINT_BITS) - 1
+
+# Заголовок потока: порядок модели
+_HEADER = struct.Struct(">B")
+
+
+class _ContextStats:
+    """Частоты символов, встреченных после одного контекста."""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+        self.total = 0
+
+    def add(self, char: str) -> None:
+        self.counts[char] = self.counts.get(char, 0) + 1
+        self.total += 1
+        if self.total + len(self.counts) >= MAX_TOTAL:
+            self.counts = {c: (count + 1) // 2 for c, count in self.counts.items()}
+            self.total = sum(self.counts.values())
+
+
+class ContextModel:
+    """
+    Адаптивная контекстная модель порядка k (PPM без исключений, уход по методу C).
+
+    Символ кодируется в самом длинном контексте из последних k символов,
+    где он уже встречался; иначе кодируется уход (с частотой, равной числу
+    различных символов контекста) и попытка повторяется с контекстом короче.
+    Если символ не встречался даже без контекста, передаётся его код Юникода.
+    Кодировщик и декодер обновляют модель одинаково.
+    """
+
+    def __init__(self, order: int = DEFAULT_ORDER):
+        self.order = order
+        # Для каждого порядка: контекст (строка из order символов) -> частоты
+        self.contexts: list[dict[str, _ContextStats]] = [{} for _ in range(order + 1)]
+        self.history = ""
+
+    def encode(self, encoder: RangeEncoder, char: str) -> None:
+        for order in range(min(self.order, len(self.history)), -1, -1):
+            stats = self.contexts[order].get(self._context(order))
+            if stats is None:
+                continue
+            total = stats.total + len(stats.counts)
+            start = 0
+            for c, count in stats.counts.items():
+                if c == char:
+                    encoder.encode(start, count, total)
+                    self._update(char)
+                    return
+                start += count
+            # Уход в контекст короче
+            encoder.encode(stats.total, len(stats.counts), total)
+
+        _encode_codepoint(encoder, ord(char))
+        self._update(char)
+
+    def decode(self, decoder: RangeDecoder) -> str | None:
+        """Декодируем символ; None — маркер конца потока."""
+        for order in range(min(self.order, len(self.history)), -1, -1):
+            stats = self.contexts[order].get(self._context(order))
+            if stats is None:
+                continue
+            total = stats.total + len(stats.counts)
+            target = decoder.get_freq(total)
+            if target >= stats.total:
+                decoder.decode(stats.total, len(stats.counts))
+                continue
+            start = 0
+            for c, count in stats.counts.items():
+                if target < start + count:
+                    decoder.decode(start, count)
+                    self._update(c)
+                    return c
+                start += count
+
+        codepoint = _decode_codepoint(decoder)
+        if codepoint == END_CODEPOINT:
+            return None
+        char = chr(codepoint)
+        self._update(char)
+        return char
+
+    def encode_end(self, encoder: RangeEncoder) -> None:
+        """Кодируем маркер конца: уход из всех контекстов и END_CODEPOINT."""
+        for order in range(min(self.order, len(self.history)), -1, -1):
+            stats = self.contexts[order].get(self._context(order))
+            if stats is not None:
+                encoder.encode(stats.total, len(stats.counts), stats.total + len(stats.counts))
+        _encode_codepoint(encoder, END_CODEPOINT)
+
+    def _context(self, order: int) -> str:
+        return self.history[len(self.history) - order:]
+
+    def _update(self, char: str) -> None:
+        for order in range(min(self.order, len(self.history)) + 1):
+            context = self._context(order)
+            stats = self.contexts[order].get(context)
+            if stats is None:
+                stats = self.contexts[order][context] = _ContextStats()
+            stats.add(char)
+        self.history = (self.history + char)[-self.order:] if self.order else ""
+
+
+def context_encode_stream(
+    source: Iterable[str] | TextIO,
+    sink: BinaryIO,
+    order: int = DEFAULT_ORDER,
+) -> int:
+    """Кодируем текст контекстной моделью порядка order и интервальным кодером."""
+    model = ContextModel(order)
+    encoder = RangeEncoder()
+    written = sink.write(_HEADER.pack(order))
+    for chunk in iter_chunks(source):
+        for char in chunk:
+            model.encode(encoder, char)
+        written += sink.write(encoder.take_bytes())
+    model.encode_end(encoder)
+    written += sink.write(encoder.finish())
+    return written
+
+
+def context_decode(data: bytes | memoryview) -> str:
+    """Декодируем байты, записанные context_encode_stream."""
+    (order,) = _HEADER.unpack_from(data)
+    model = ContextModel(order)
+    decoder = RangeDecoder(memoryview(data)[_HEADER.size:])
+    decoded = []
+    while True:
+        char = model.decode(decoder)
+        if char is None:
+            return "".join(decoded)
+        decoded.append(char)
+
+
+def _encode_codepoint(encoder: RangeEncoder, codepoint: int) -> None:
+    encoder.encode(codepoint >> _LOW_BITS, 1, 1 << _HIGH_BITS)
+    encoder.encode(codepoint & ((1 << _LOW_BITS) - 1), 1, 1 << _LOW_BITS)
+
+
+def _decode_codepoint(decoder: RangeDecoder) -> int:
+    high = decoder.get_freq(1 << _HIGH_BITS)
+    decoder.decode(high, 1)
+    low = decoder.get_freq(1 << _LOW_BITS)
+    decoder.decode(low, 1)
+    return (high << _LOW_BITS) | low
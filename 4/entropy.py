@@ -0,0 +1,45 @@
+from math import log2
+
+from frequencies import MAX_CHAR_NGRAM, count_char_ngrams
+
+
+def shannon_entropy(freq_dict: dict[str, int]) -> float:
+    """Энтропия на символ по формуле Шеннона: H = -sum(p * log2(p))."""
+    total = sum(freq_dict.values())
+    return -sum((freq / total) * log2(freq / total) for freq in freq_dict.values() if freq)
+
+
+def conditional_entropy(ngram_freq: dict[str, int]) -> float:
+    """
+    Условная энтропия последнего символа n-граммы при известных предыдущих n - 1.
+
+    H(X | C) = -sum(p(cx) * log2(p(cx) / p(c))), где c — контекст из первых
+    n - 1 символов, а p(c) — доля n-грамм, начинающихся с c.
+    Для пар это H(X2 | X1).
+    """
+    total = sum(ngram_freq.values())
+    context_freq: dict[str, int] = {}
+    for ngram, freq in ngram_freq.items():
+        context_freq[ngram[:-1]] = context_freq.get(ngram[:-1], 0) + freq
+
+    return -sum(
+        (freq / total) * log2(freq / context_freq[ngram[:-1]])
+        for ngram, freq in ngram_freq.items()
+        if freq
+    )
+
+
+def context_entropies(path: str, max_order: int = MAX_CHAR_NGRAM - 1) -> list[float]:
+    """
+    Считаем H(X | k предыдущих символов) для k = 0..max_order по таблицам n-грамм файла.
+
+    Порядок ограничен длиной n-грамм, которые умеет считать count_char_ngrams.
+    """
+    if not 0 <= max_order < MAX_CHAR_NGRAM:
+        raise ValueError(f"max_order должен быть от 0 до {MAX_CHAR_NGRAM - 1}")
+
+    entropies = []
+    for order in range(max_order + 1):
+        ngram_freq = count_char_ngrams(path, order + 1)
+        entropies.append(conditional_entropy(ngram_freq) if ngram_freq else 0.0)
+    return entropies
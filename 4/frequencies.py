@@ -0,0 +1,134 @@
+import mmap
+from collections.abc import Iterator
+
+import numpy
+
+
+# Сколько байт файла обрабатывается за один проход NumPy
+BLOCK_SIZE = 1 << 22
+# Максимальная длина n-граммы, ключ которой помещается в uint64
+MAX_BYTE_NGRAM = 8
+MAX_CHAR_NGRAM = 3
+# Бит на символ Юникода в ключе n-граммы
+CODEPOINT_BITS = 21
+
+
+def count_byte_ngrams(path: str, n: int = 1) -> dict[bytes, int]:
+    """
+    Считаем частоты n-грамм байт в файле.
+
+    Файл отображается в память и обрабатывается блоками по BLOCK_SIZE байт,
+    поэтому память не зависит от размера файла. Для n <= 2 счётчик —
+    плотный массив из 256^n ячеек (bincount по a * 256 + b),
+    для больших n — отсортированные уникальные ключи n-грамм.
+    """
+    if not 1 <= n <= MAX_BYTE_NGRAM:
+        raise ValueError(f"n должно быть от 1 до {MAX_BYTE_NGRAM}")
+
+    blocks = _byte_blocks(path, n)
+    if n <= 2:
+        counts = numpy.zeros(256 ** n, dtype=numpy.int64)
+        for block in blocks:
+            counts += numpy.bincount(_ngram_keys(block, n, 8), minlength=256 ** n)
+        keys = numpy.flatnonzero(counts)
+        return {int(key).to_bytes(n, "big"): int(counts[key]) for key in keys}
+
+    keys, counts = _count_sparse(blocks, n, 8)
+    return {int(key).to_bytes(n, "big"): int(count) for key, count in zip(keys, counts)}
+
+
+def count_char_ngrams(path: str, n: int = 1, encoding: str = "utf-8") -> dict[str, int]:
+    """
+    Считаем частоты n-грамм символов Юникода в текстовом файле.
+
+    Файл отображается в память, каждый блок декодируется целиком
+    (границы блоков сдвигаются до начала символа UTF-8) и переводится
+    в массив кодов символов, дальше счёт идёт так же, как для байт.
+    """
+    if not 1 <= n <= MAX_CHAR_NGRAM:
+        raise ValueError(f"n должно быть от 1 до {MAX_CHAR_NGRAM}")
+
+    keys, counts = _count_sparse(_char_blocks(path, n, encoding), n, CODEPOINT_BITS)
+    mask = (1 << CODEPOINT_BITS) - 1
+    return {
+        "".join(chr((int(key) >> (CODEPOINT_BITS * (n - 1 - i))) & mask) for i in range(n)): int(count)
+        for key, count in zip(keys, counts)
+    }
+
+
+def _ngram_keys(symbols: numpy.ndarray, n: int, bits: int) -> numpy.ndarray:
+    """Упаковываем каждую n-грамму массива в одно число: s0 << bits*(n-1) | ... | s(n-1)."""
+    size = len(symbols) - n + 1
+    if size <= 0:
+        return numpy.zeros(0, dtype=numpy.uint64)
+
+    keys = symbols[:size].astype(numpy.uint64)
+    for i in range(1, n):
+        keys <<= numpy.uint64(bits)
+        keys |= symbols[i:i + size]
+    return keys
+
+
+def _count_sparse(
+    blocks: Iterator[numpy.ndarray],
+    n: int,
+    bits: int,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Считаем n-граммы по блокам, храня только различные ключи и их частоты."""
+    keys = numpy.zeros(0, dtype=numpy.uint64)
+    counts = numpy.zeros(0, dtype=numpy.int64)
+    for block in blocks:
+        block_keys, block_counts = numpy.unique(_ngram_keys(block, n, bits), return_counts=True)
+        # Сливаем с накопленным: общий набор ключей и сумма частот
+        keys, inverse = numpy.unique(numpy.concatenate((keys, block_keys)), return_inverse=True)
+        counts = numpy.bincount(
+            inverse,
+            weights=numpy.concatenate((counts, block_counts)),
+            minlength=len(keys),
+        ).astype(numpy.int64)
+    return keys, counts
+
+
+def _byte_blocks(path: str, n: int) -> Iterator[numpy.ndarray]:
+    """
+    Перебираем блоки байт файла как массивы uint8.
+
+    Последние n - 1 байт блока повторяются в начале следующего,
+    чтобы n-граммы на стыке блоков не терялись.
+    """
+    with open(path, "rb") as fp, _map_file(fp) as mapped:
+        for start in range(0, len(mapped), BLOCK_SIZE):
+            yield numpy.frombuffer(mapped[max(start - n + 1, 0):start + BLOCK_SIZE], dtype=numpy.uint8)
+
+
+def _char_blocks(path: str, n: int, encoding: str) -> Iterator[numpy.ndarray]:
+    """
+    Перебираем блоки файла как массивы кодов символов uint32 с перекрытием в n - 1 символ.
+
+    Поддерживаются UTF-8 и однобайтовые кодировки.
+    """
+    is_utf8 = encoding.replace("-", "").replace("_", "").lower() == "utf8"
+    carry = numpy.zeros(0, dtype=numpy.uint32)
+    with open(path, "rb") as fp, _map_file(fp) as mapped:
+        start = 0
+        while start < len(mapped):
+            end = min(start + BLOCK_SIZE, len(mapped))
+            if is_utf8:
+                # Не разрезаем многобайтный символ: отступаем от байт-продолжений 10xxxxxx
+                while start < end < len(mapped) and mapped[end] & 0xC0 == 0x80:
+                    end -= 1
+                if end == start:
+                    raise ValueError(f"Файл {path} не является текстом в UTF-8")
+
+            text = mapped[start:end].decode(encoding)
+            block = numpy.concatenate((carry, numpy.frombuffer(text.encode("utf-32-le"), dtype=numpy.uint32)))
+            yield block
+            carry = block[max(len(block) - n + 1, 0):]
+            start = end
+
+
+def _map_file(fp) -> mmap.mmap | memoryview:
+    """Отображаем файл в память; пустой файл mmap не поддерживает."""
+    if fp.seek(0, 2) == 0:
+        return memoryview(b"")
+    return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
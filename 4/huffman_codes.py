@@ -1,6 +1,28 @@
 from __future__ import annotations
 
 import heapq
+import math
+import struct
+from collections.abc import Iterable
+from typing import BinaryIO, TextIO
+
+import numpy
+
+from bitio import iter_chunks
+
+
+# Сколько бит декодер просматривает за одно обращение к таблице
+DEFAULT_LOOKUP_BITS = 16
+# Сколько байт входа декодер обрабатывает за один проход NumPy
+DECODE_BLOCK_BYTES = 1 << 20
+# Длина участка потока, который декодирует одна дорожка, в битах
+LANE_BITS = 2048
+# Заполнитель записей таблицы символов: больше любого кода Unicode
+_NO_CHAR = 0xFFFFFFFF
+_THREE = numpy.uint64(3)
+_SEVEN = numpy.uint64(7)
+# Коды длиннее окна декодируются канонически по 57 битам: 64-битное слово минус сдвиг внутри байта
+_CANONICAL_BITS = 57
 
 
 class Node:
@@ -27,17 +49,471 @@ def huffman_encode(text: str, freq_dict: dict[str, int]) -> str:
     return "".join(codes[ch] for ch in text if ch in codes)
 
 
+def build_code_table(
+    freq_dict: dict[str, int],
+    max_length: int | None = None,
+) -> dict[str, tuple[int, int]]:
+    """
+    Формируем таблицу канонических кодов Хаффмана для потокового кодирования.
+
+    Коды назначаются канонически по длинам из huffman_code_lengths,
+    чтобы декодер мог восстановить их по заголовку с одними длинами.
+    Возвращает словарь {символ: (код как целое число, длина кода в битах)}.
+    """
+    return assign_canonical_codes(huffman_code_lengths(freq_dict, max_length))
+
+
+def huffman_code_lengths(freq_dict: dict[str, int], max_length: int | None = None) -> dict[str, int]:
+    """
+    Считаем длины кодов Хаффмана без построения самих кодов.
+
+    Если задан max_length, длины ограничиваются им по алгоритму package-merge
+    (оптимальный префиксный код среди кодов с длиной не больше max_length).
+    Для пустого словаря (пустой текст) возвращается пустой словарь.
+    """
+    if not freq_dict:
+        return {}
+    if max_length is None:
+        return _code_lengths(_build_huffman_tree(freq_dict))
+    return _package_merge_lengths(freq_dict, max_length)
+
+
+def assign_canonical_codes(code_lengths: dict[str, int]) -> dict[str, tuple[int, int]]:
+    """
+    Назначаем канонические коды по длинам.
+
+    Символы сортируются по (длина, символ), коды идут подряд
+    и сдвигаются влево при переходе к большей длине.
+    """
+    codes = {}
+    code = 0
+    prev_length = 0
+    for char in sorted(code_lengths, key=lambda char: (code_lengths[char], char)):
+        length = code_lengths[char]
+        code <<= length - prev_length
+        codes[char] = (code, length)
+        code += 1
+        prev_length = length
+    return codes
+
+
+def write_huffman_header(code_lengths: dict[str, int]) -> bytes:
+    """
+    Сериализуем длины канонических кодов в компактный заголовок.
+
+    Формат (big-endian):
+      - 1 байт: максимальная длина кода L;
+      - L чисел uint32: сколько символов имеют длину 1, 2, ..., L;
+      - uint32: размер следующего блока в байтах;
+      - символы в каноническом порядке (длина, символ) в UTF-8.
+    Самих кодов в заголовке нет, декодер назначает их канонически.
+    Пустая таблица (пустой текст) записывается с L = 0.
+    """
+    if any(len(char) != 1 for char in code_lengths):
+        raise ValueError("В заголовок можно записать только односимвольные ключи")
+
+    max_length = max(code_lengths.values(), default=0)
+    counts = [0] * max_length
+    for length in code_lengths.values():
+        counts[length - 1] += 1
+
+    symbols = "".join(sorted(code_lengths, key=lambda char: (code_lengths[char], char))).encode("utf-8")
+    return (
+        struct.pack(f">B{max_length}II", max_length, *counts, len(symbols))
+        + symbols
+    )
+
+
+def read_huffman_header(data: bytes | memoryview) -> tuple[dict[str, int], int]:
+    """
+    Разбираем заголовок, записанный write_huffman_header.
+
+    Возвращает словарь {символ: длина кода} и размер заголовка в байтах.
+    """
+    (max_length,) = struct.unpack_from(">B", data, 0)
+    *counts, symbols_size = struct.unpack_from(f">{max_length}II", data, 1)
+    offset = 1 + 4 * max_length + 4
+    symbols = bytes(data[offset:offset + symbols_size]).decode("utf-8")
+    if len(symbols) != sum(counts):
+        raise ValueError("Повреждённый заголовок Хаффмана")
+
+    code_lengths = {}
+    position = 0
+    for length, count in enumerate(counts, start=1):
+        for char in symbols[position:position + count]:
+            code_lengths[char] = length
+        position += count
+
+    return code_lengths, offset + symbols_size
+
+
+def huffman_encode_stream(
+    source: Iterable[str] | TextIO,
+    code_table: dict[str, tuple[int, int]],
+    sink: BinaryIO,
+) -> int:
+    """
+    Потоково кодируем текст по алгоритму Хаффмана в упакованные байты.
+
+    source — итерируемый набор кусков текста или открытый текстовый файл.
+    Биты пишутся в sink старшим разрядом вперёд, последний байт дополняется нулями.
+    В памяти держится только текущий кусок и его закодированные байты,
+    поэтому размер входа не ограничен. Символ, которого нет в таблице, — ошибка
+    ValueError: пропустить его молча значило бы потерять данные.
+
+    Возвращает количество значащих бит (без дополнения последнего байта).
+    """
+    acc = 0       # Накопитель ещё не записанных бит
+    acc_bits = 0  # Сколько бит лежит в накопителе
+    written_bytes = 0
+    get_code = code_table.get
+
+    for chunk in iter_chunks(source):
+        out = bytearray()
+        for ch in chunk:
+            entry = get_code(ch)
+            if entry is None:
+                raise ValueError(f"Символа {ch!r} нет в таблице кодов")
+            code, length = entry
+            acc = (acc << length) | code
+            acc_bits += length
+            # Сбрасываем по 64 бита, чтобы накопитель не рос
+            while acc_bits >= 64:
+                acc_bits -= 64
+                out += (acc >> acc_bits).to_bytes(8, "big")
+                acc &= (1 << acc_bits) - 1
+        sink.write(out)
+        written_bytes += len(out)
+
+    # Дописываем хвост, дополняя его нулями до целого байта
+    total_bits = written_bytes * 8 + acc_bits
+    if acc_bits:
+        tail_bytes = (acc_bits + 7) // 8
+        sink.write((acc << (tail_bytes * 8 - acc_bits)).to_bytes(tail_bytes, "big"))
+
+    return total_bits
+
+
+def huffman_decode(
+    data: bytes | memoryview,
+    total_bits: int,
+    freq_dict: dict[str, int],
+    max_length: int | None = None,
+) -> str:
+    """Декодируем упакованные байты, полученные huffman_encode_stream с таблицей build_code_table."""
+    decoder = HuffmanDecoder(huffman_code_lengths(freq_dict, max_length))
+    return decoder.decode(data, total_bits)
+
+
+class HuffmanDecoder:
+    """
+    Табличный декодер канонического кода Хаффмана.
+
+    Вместо обхода дерева по одному биту декодер смотрит сразу на lookup_bits бит:
+    запись таблицы хранит все символы, целиком помещающиеся в это окно, и число
+    использованных бит. Коды длиннее окна декодируются канонически по
+    левовыровненным границам длин (searchsorted).
+
+    Переходы от окна к окну идут не по одному в Python, а сразу на многих
+    дорожках: блок потока режется на участки по LANE_BITS бит, и каждая дорожка
+    в NumPy декодирует свой участок, начиная с его первого бита. Начало участка
+    может не совпасть с границей кода, но код Хаффмана быстро
+    самосинхронизируется: дорожка, вошедшая в участок не там, где закончила
+    предыдущая, проходит заново от настоящей точки входа по одному символу
+    только до первой позиции, уже лежащей на её пути, и дальше путь совпадает.
+    Участки кратны НОД длин кодов, поэтому и коды одной длины синхронизируются.
+    Хвост потока короче окна декодируется побитово по каноническим таблицам.
+    """
+
+    def __init__(self, code_lengths: dict[str, int], lookup_bits: int = DEFAULT_LOOKUP_BITS):
+        if not 1 <= lookup_bits <= 24:
+            raise ValueError("lookup_bits должно быть от 1 до 24")
+
+        self.lookup_bits = lookup_bits
+
+        # Канонические таблицы для побитового декодирования
+        self._max_length = max(code_lengths.values())
+        self._counts = [0] * (self._max_length + 1)
+        for length in code_lengths.values():
+            self._counts[length] += 1
+        self._sorted_symbols = sorted(code_lengths, key=lambda char: (code_lengths[char], char))
+
+        # Таблица одного символа: окно -> (код символа, длина кода)
+        size = 1 << lookup_bits
+        mask = size - 1
+        single_chars = numpy.zeros(size, dtype="<u4")
+        single_lengths = numpy.zeros(size, dtype=numpy.int64)
+        for char, (code, length) in assign_canonical_codes(code_lengths).items():
+            if length > lookup_bits:
+                continue
+            first = code << (lookup_bits - length)
+            single_chars[first:first + (1 << (lookup_bits - length))] = ord(char)
+            single_lengths[first:first + (1 << (lookup_bits - length))] = length
+
+        # Таблица нескольких символов: окно -> (символы, число бит); строится сразу для всех окон,
+        # на каждом шаге к окну добавляется следующий символ, если он целиком помещается
+        windows = numpy.arange(size, dtype=numpy.int64)
+        used = numpy.zeros(size, dtype=numpy.int64)
+        growing = numpy.ones(size, dtype=bool)
+        columns = []
+        while True:
+            rest = (windows << used) & mask
+            length = single_lengths[rest]
+            growing &= (length > 0) & (used + length <= lookup_bits)
+            if not growing.any():
+                break
+            columns.append(numpy.where(growing, single_chars[rest], _NO_CHAR).astype("<u4"))
+            used += numpy.where(growing, length, 0)
+        self._advances = used.astype(numpy.uint64)
+        self._row_shift = numpy.uint64(64 - lookup_bits)
+
+        # Строки таблицы и отдельные символы длинных кодов как коды символов:
+        # запись i — символы окна i, запись size + j — j-й символ в каноническом порядке.
+        # Записи дополнены до одной ширины значением, которое не бывает кодом символа,
+        # и склеены в элементы по width * 4 байта, чтобы выбирать их одним обращением
+        width = max(len(columns), 1)
+        row_chars = numpy.full((size + len(self._sorted_symbols), width), _NO_CHAR, dtype="<u4")
+        for column, chars in enumerate(columns):
+            row_chars[:size, column] = chars
+        row_chars[size:, 0] = [ord(char) for char in self._sorted_symbols]
+        self._row_chars = row_chars.view(f"V{4 * width}").ravel()
+
+        # Если все длины кодов кратны d, границы кодов идут через d бит от начала потока:
+        # участки дорожек кратны d, чтобы дорожки начинались на возможной границе
+        step = math.gcd(*code_lengths.values())
+        self._lane_bits = -(-LANE_BITS // step) * step
+
+        # Канонический разбор длинного кода: длина — число границ не больше окна,
+        # номер символа — смещение от первого кода этой длины
+        self._vectorized = self._max_length <= _CANONICAL_BITS
+        if self._vectorized:
+            limits = []
+            first_codes = [0]
+            index_base = [0]
+            first = 0
+            for length in range(1, self._max_length + 1):
+                count = self._counts[length]
+                limits.append((first + count) << (_CANONICAL_BITS - length))
+                first_codes.append(first)
+                index_base.append(index_base[-1] + self._counts[length - 1])
+                first = (first + count) << 1
+            self._limits = numpy.array(limits, dtype=numpy.uint64)
+            self._first_codes = numpy.array(first_codes + [0], dtype=numpy.uint64)
+            self._index_base = numpy.array(index_base + [0], dtype=numpy.uint64)
+
+    @classmethod
+    def from_header(
+        cls,
+        data: bytes | memoryview,
+        lookup_bits: int = DEFAULT_LOOKUP_BITS,
+    ) -> tuple[HuffmanDecoder, int]:
+        """Создаём декодер по заголовку write_huffman_header, возвращаем его и размер заголовка."""
+        code_lengths, header_size = read_huffman_header(data)
+        return cls(code_lengths, lookup_bits), header_size
+
+    def decode(self, data: bytes | memoryview, total_bits: int) -> str:
+        """Декодируем первые total_bits бит из data."""
+        view = memoryview(data).cast("B")
+        # Начиная с этой позиции окно выходит за значащие биты
+        fast_end = total_bits - self.lookup_bits + 1
+
+        parts: list[str] = []
+        position = 0
+        if self._vectorized and fast_end > 0:
+            # Восемь байт, начиная с каждого байта, как одно big-endian слово (без копирования слов)
+            padded = numpy.zeros(len(view) + 8, dtype=numpy.uint8)
+            padded[:len(view)] = numpy.frombuffer(view, dtype=numpy.uint8)
+            words = numpy.ndarray((len(view) + 1,), dtype=">u8", buffer=padded, strides=(1,))
+
+            block_bits = DECODE_BLOCK_BYTES * 8
+            while position < fast_end:
+                rows, position = self._decode_block(words, position, min(position + block_bits, fast_end))
+                parts.append(self._rows_to_text(rows))
+
+        while position < total_bits:
+            char, position = self._decode_slow(view, position, total_bits)
+            parts.append(char)
+        if position > total_bits:
+            raise ValueError("Поток обрывается посреди кода Хаффмана")
+
+        return "".join(parts)
+
+    def _decode_block(self, words: numpy.ndarray, start: int, end: int) -> tuple[numpy.ndarray, int]:
+        """
+        Декодируем путь, начинающийся ровно в start, до первой позиции не меньше end.
+
+        Возвращает записи таблицы на пути (по порядку) и позицию выхода.
+        Внутри позиции считаются в битах от начала первого байта блока, в uint64,
+        чтобы сдвиги и индексы обходились без преобразований типов.
+        """
+        first_byte = start >> 3
+        base = first_byte * 8
+        block_words = words[first_byte:((end - 1) >> 3) + 1].astype(numpy.uint64)
+        start, end = start - base, end - base
+        on_path = numpy.zeros(end, dtype=bool)
+        # Позиции, пройденные при исправлении: с них декодируется один символ, а не запись окна
+        single = numpy.zeros(end, dtype=bool)
+
+        # Предположительный проход: каждая дорожка начинает с первого бита своего участка
+        lane_starts = numpy.arange(start, end, self._lane_bits, dtype=numpy.uint64)
+        lane_ends = numpy.minimum(lane_starts + numpy.uint64(self._lane_bits), numpy.uint64(end))
+        exits = self._walk(block_words, lane_starts, lane_ends, on_path)
+
+        # Исправление: дорожка должна начинаться там, где вышла предыдущая. Идём от
+        # настоящей точки входа по одному символу: так проходятся все границы кодов,
+        # и путь обязательно встретит предположительный, если тот уже синхронизировался
+        entries = lane_starts.copy()
+        while True:
+            expected = numpy.concatenate((numpy.array([start], dtype=numpy.uint64), exits[:-1]))
+            stale = numpy.flatnonzero(expected != entries)
+            if not stale.size:
+                break
+            stops, synced, positions = self._walk(block_words, expected[stale], lane_ends[stale], on_path, resync=True)
+            # Старый путь до точки синхронизации неверен: очищаем его и кладём новый
+            clear = _ranges(
+                lane_starts[stale].astype(numpy.int64),
+                (numpy.minimum(stops, lane_ends[stale]) - lane_starts[stale]).astype(numpy.int64),
+            )
+            on_path[clear] = False
+            single[clear] = False
+            on_path[positions] = True
+            single[positions] = True
+
+            entries[stale] = expected[stale]
+            exits[stale] = numpy.where(synced, exits[stale], stops)
+
+        # Запись таблицы зависит только от позиции, поэтому считаем её один раз для готового пути
+        positions = numpy.flatnonzero(on_path).astype(numpy.uint64)
+        rows, _ = self._lookup(block_words, positions)
+        corrected = single[positions]
+        if corrected.any():
+            rows[corrected], _ = self._lookup_single(block_words, positions[corrected])
+        return rows, int(exits[-1]) + base
+
+    def _walk(
+        self,
+        words: numpy.ndarray,
+        positions: numpy.ndarray,
+        ends: numpy.ndarray,
+        on_path: numpy.ndarray,
+        resync: bool = False,
+    ):
+        """
+        Идём сразу на всех дорожках, пока каждая не дойдёт до своего конца.
+
+        Обычный проход идёт по записям таблицы, отмечает путь в on_path и
+        возвращает позиции выхода. При resync шаг — один символ, и дорожка
+        останавливается на первой позиции, уже лежащей на пути (синхронизация);
+        тогда возвращаются позиции остановки, признак синхронизации и пройденные
+        позиции — on_path не трогается.
+        """
+        lane_count = len(positions)
+        lanes = numpy.arange(lane_count)
+        stops = numpy.empty(lane_count, dtype=numpy.uint64)
+        synced = numpy.zeros(lane_count, dtype=bool)
+        visited_positions = []
+        lookup = self._lookup_single if resync else self._lookup
+
+        while True:
+            finished = positions >= ends
+            if resync:
+                hit = numpy.zeros(len(positions), dtype=bool)
+                inside = ~finished
+                hit[inside] = on_path[positions[inside]]
+                synced[lanes[hit]] = True
+                finished |= hit
+            if finished.any():
+                stops[lanes[finished]] = positions[finished]
+                keep = ~finished
+                positions, ends, lanes = positions[keep], ends[keep], lanes[keep]
+                if not positions.size:
+                    break
+
+            _, advances = lookup(words, positions)
+            if resync:
+                visited_positions.append(positions)
+            else:
+                on_path[positions] = True
+            positions = positions + advances
+
+        if not resync:
+            return stops
+        if visited_positions:
+            return stops, synced, numpy.concatenate(visited_positions)
+        return stops, synced, numpy.empty(0, dtype=numpy.uint64)
+
+    def _lookup(self, words: numpy.ndarray, positions: numpy.ndarray):
+        """Запись таблицы и число бит для окна на каждой позиции; недопустимый код — запись за концом таблицы."""
+        window = words[positions >> _THREE] << (positions & _SEVEN)
+        rows = window >> self._row_shift
+        advances = self._advances[rows]
+
+        long_codes = advances == 0
+        if long_codes.any():
+            rows[long_codes], advances[long_codes] = self._canonical(window[long_codes])
+        return rows, advances
+
+    def _lookup_single(self, words: numpy.ndarray, positions: numpy.ndarray):
+        """Один символ на каждой позиции: запись таблицы с этим символом и длина его кода."""
+        return self._canonical(words[positions >> _THREE] << (positions & _SEVEN))
+
+    def _canonical(self, window: numpy.ndarray):
+        """Канонический разбор кода в начале окна: длина — число границ не больше окна."""
+        top = window >> numpy.uint64(64 - _CANONICAL_BITS)
+        lengths = numpy.searchsorted(self._limits, top, side="right") + 1
+        valid = lengths <= self._max_length
+        lengths = numpy.where(valid, lengths, 0)
+        shifts = (_CANONICAL_BITS - lengths).astype(numpy.uint64)
+        symbols = self._index_base[lengths] + (top >> shifts) - self._first_codes[lengths]
+        rows = numpy.where(valid, len(self._advances) + symbols, len(self._row_chars)).astype(numpy.uint64)
+        # Недопустимое окно встретится только вне настоящего пути, идём дальше по одному биту
+        return rows, numpy.where(valid, lengths, 1).astype(numpy.uint64)
+
+    def _rows_to_text(self, rows: numpy.ndarray) -> str:
+        """Склеиваем символы записей таблицы в строку."""
+        if rows.size and rows.max() >= len(self._row_chars):
+            raise ValueError("Повреждённый поток Хаффмана")
+        chars = numpy.take(self._row_chars, rows).view("<u4")
+        return chars[chars != _NO_CHAR].tobytes().decode("utf-32-le", errors="surrogatepass")
+
+    def _decode_slow(self, view: memoryview, position: int, total_bits: int) -> tuple[str, int]:
+        """Декодируем один символ побитово, возвращаем символ и новую позицию."""
+        code = 0
+        first = 0
+        index = 0
+        for length in range(1, self._max_length + 1):
+            if position >= total_bits:
+                break
+            code |= (view[position >> 3] >> (7 - (position & 7))) & 1
+            position += 1
+            count = self._counts[length]
+            if code - first < count:
+                return self._sorted_symbols[index + code - first], position
+            index += count
+            first = (first + count) << 1
+            code <<= 1
+
+        raise ValueError("Поток обрывается посреди кода Хаффмана")
+
+
+def _ranges(starts: numpy.ndarray, lengths: numpy.ndarray) -> numpy.ndarray:
+    """Все индексы полуинтервалов [start, start + length) одним массивом."""
+    lengths = numpy.maximum(lengths, 0)
+    total = int(lengths.sum())
+    if not total:
+        return numpy.empty(0, dtype=numpy.int64)
+    offsets = numpy.cumsum(lengths) - lengths
+    return numpy.repeat(starts - offsets, lengths) + numpy.arange(total)
+
+
 def _compress_by_huffman_codes(freq_dict: dict[str, int]) -> dict[str, str]:
     """
     Формируем коды Хаффмана.
 
-    Возвращает словарь {символ: код Хаффмана}.
+    Возвращает словарь {символ: канонический код Хаффмана}.
     """
-    # Строим дерево Хаффмана
-    root = _build_huffman_tree(freq_dict)
-    # Присваиваем коды
-    codes = _assign_codes(root)
-    return codes
+    codes = build_code_table(freq_dict)
+    return {char: format(code, f"0{length}b") for char, (code, length) in codes.items()}
 
 
 def _build_huffman_tree(freq_dict: dict[str, int]) -> Node:
@@ -58,17 +534,52 @@ def _build_huffman_tree(freq_dict: dict[str, int]) -> Node:
     return heap[0]
 
 
-def _assign_codes(node: Node, code: str = "", code_dict: dict | None = None) -> dict[str, str]:
-    if code_dict is None:
-        code_dict = {}
+def _code_lengths(root: Node) -> dict[str, int]:
+    """Считаем длины кодов по глубине листьев дерева Хаффмана."""
+    lengths = {}
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if node.char is not None:
+            # Единственный символ всё равно кодируется одним битом
+            lengths[node.char] = depth or 1
+        else:
+            stack.append((node.left, depth + 1))
+            stack.append((node.right, depth + 1))
+    return lengths
+
+
+def _package_merge_lengths(freq_dict: dict[str, int], max_length: int) -> dict[str, int]:
+    """
+    Считаем длины кодов, ограниченные max_length, алгоритмом package-merge.
+
+    На каждом из max_length - 1 шагов соседние элементы списка объединяются
+    в «пакеты», которые сливаются с исходными листьями по весу.
+    Длина кода символа равна числу вхождений его листа
+    в первые 2n - 2 элемента итогового списка.
+    """
+    if len(freq_dict) == 1:
+        return {char: 1 for char in freq_dict}
+    if len(freq_dict) > 1 << max_length:
+        raise ValueError(f"{len(freq_dict)} символов не закодировать кодами длины не больше {max_length}")
 
-    if node is None:
-        return code_dict
+    # Лист — сам символ, пакет — пара вложенных элементов
+    leaves = sorted(((freq, char) for char, freq in freq_dict.items()), key=lambda item: item[0])
+    items = leaves
+    for _ in range(max_length - 1):
+        packages = [
+            (items[i][0] + items[i + 1][0], (items[i][1], items[i + 1][1]))
+            for i in range(0, len(items) - 1, 2)
+        ]
+        items = list(heapq.merge(leaves, packages, key=lambda item: item[0]))
 
-    if node.char is not None:
-        code_dict[node.char] = code or "0"
-    else:
-        _assign_codes(node.left, code + "0", code_dict)
-        _assign_codes(node.right, code + "1", code_dict)
+    lengths = dict.fromkeys(freq_dict, 0)
+    stack = [node for _, node in items[:2 * len(freq_dict) - 2]]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, tuple):
+            stack.extend(node)
+        else:
+            lengths[node] += 1
 
-    return code_dict
+    return lengths
@@ -1,4 +1,16 @@
+import io
 import math
+import struct
+from collections.abc import Iterable, Sequence
+from typing import BinaryIO, TextIO
+
+from bitio import BitWriter, iter_chunks
+
+
+# Максимальная ширина кода по умолчанию: словарь до 2^16 записей
+DEFAULT_MAX_CODE_WIDTH = 16
+# Сколько декодированных строк декодер копит перед записью в поток
+DECODE_FLUSH_STRINGS = 1 << 12
 
 
 def lzw_encode(text: str) -> str:
@@ -12,6 +24,192 @@ def lzw_encode(text: str) -> str:
     return "".join(f"{code:0{bits_per_code}b}" for code in output_codes)
 
 
+def lzw_encode_stream(
+    source: Iterable[str] | TextIO,
+    alphabet: Sequence[str],
+    sink: BinaryIO,
+    max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+) -> int:
+    """
+    Потоково кодируем текст по алгоритму LZW в упакованные байты.
+
+    Сначала пишется заголовок write_lzw_header, поэтому результат
+    самодостаточен и декодируется lzw_decode без дополнительных параметров.
+    Коды 0..len(alphabet)-1 соответствуют символам алфавита, за ними идут
+    служебные коды очистки словаря (CLEAR) и конца потока (END).
+    Ширина кода растёт вместе со словарём: код пишется шириной,
+    достаточной для наибольшего кода словаря на момент записи.
+    Когда словарь достигает 2^max_code_width записей, пишется CLEAR
+    и словарь начинается заново, поэтому память ограничена.
+
+    Возвращает количество значащих бит кодов (без заголовка и дополнения последнего байта).
+    """
+    alphabet_size = len(alphabet)
+    clear_code = alphabet_size
+    end_code = alphabet_size + 1
+    first_free = alphabet_size + 2
+    max_dict_size = 1 << max_code_width
+    if first_free >= max_dict_size:
+        raise ValueError(f"Алфавит из {alphabet_size} символов не помещается в коды ширины {max_code_width}")
+
+    symbol_index = {char: index for index, char in enumerate(alphabet)}
+    if len(symbol_index) != alphabet_size:
+        raise ValueError("Символы алфавита должны быть уникальны")
+
+    sink.write(write_lzw_header(alphabet, max_code_width))
+    writer = BitWriter(sink)
+    # Ребро префиксного дерева: prefix_code * alphabet_size + symbol -> код
+    table: dict[int, int] = {}
+    next_code = first_free
+    width = (next_code - 1).bit_length()
+    prefix = -1  # Код текущей строки, -1 — строка пуста
+
+    for chunk in iter_chunks(source):
+        for char in chunk:
+            symbol = symbol_index.get(char)
+            if symbol is None:
+                raise ValueError(f"Символ {char!r} отсутствует в алфавите")
+            if prefix < 0:
+                prefix = symbol
+                continue
+
+            key = prefix * alphabet_size + symbol
+            code = table.get(key)
+            if code is not None:
+                prefix = code
+                continue
+
+            writer.write(prefix, width)
+            table[key] = next_code
+            next_code += 1
+            if next_code == max_dict_size:
+                writer.write(clear_code, width)
+                table.clear()
+                next_code = first_free
+            width = (next_code - 1).bit_length()
+            prefix = symbol
+
+    if prefix >= 0:
+        writer.write(prefix, width)
+        # Декодер сдвигает счётчик словаря после каждого кода, в том числе последнего
+        width = next_code.bit_length()
+    writer.write(end_code, width)
+    writer.flush()
+
+    return writer.total_bits
+
+
+def lzw_decode(data: bytes | memoryview) -> str:
+    """Декодируем байты, записанные lzw_encode_stream."""
+    sink = io.StringIO()
+    lzw_decode_stream(data, sink)
+    return sink.getvalue()
+
+
+def lzw_decode_stream(data: bytes | memoryview, sink: TextIO) -> int:
+    """
+    Декодируем байты, записанные lzw_encode_stream, и пишем текст в sink.
+
+    Алфавит и максимальная ширина кода берутся из заголовка. Декодер ведёт
+    тот же счётчик словаря, что и кодировщик, поэтому знает ширину каждого кода.
+
+    Возвращает количество декодированных символов.
+    """
+    view = memoryview(data).cast("B")
+    alphabet, max_code_width, offset = read_lzw_header(view)
+    alphabet_size = len(alphabet)
+    clear_code = alphabet_size
+    end_code = alphabet_size + 1
+    first_free = alphabet_size + 2
+    max_dict_size = 1 << max_code_width
+
+    # Строки словаря; на месте служебных кодов стоят заглушки
+    entries = list(alphabet) + ["", ""]
+    next_code = first_free
+    width = (next_code - 1).bit_length()
+    prev = ""  # Предыдущая декодированная строка, "" — начало словаря
+
+    acc = 0       # Накопитель прочитанных, но не разобранных бит
+    acc_bits = 0
+    decoded: list[str] = []
+    total_chars = 0
+
+    while True:
+        while acc_bits < width:
+            if offset >= len(view):
+                raise ValueError("Поток LZW обрывается без кода конца")
+            portion = view[offset:offset + 8]
+            acc = (acc << (8 * len(portion))) | int.from_bytes(portion, "big")
+            acc_bits += 8 * len(portion)
+            offset += len(portion)
+
+        acc_bits -= width
+        code = acc >> acc_bits
+        acc &= (1 << acc_bits) - 1
+
+        if code == end_code:
+            break
+        if code == clear_code:
+            del entries[first_free:]
+            next_code = first_free
+            width = (next_code - 1).bit_length()
+            prev = ""
+            continue
+
+        if code < len(entries):
+            current = entries[code]
+        elif code == len(entries) and prev:
+            # Случай cScSc: код ссылается на строку, которая только сейчас добавляется
+            current = prev + prev[0]
+        else:
+            raise ValueError(f"Недопустимый код LZW {code}")
+
+        if prev:
+            entries.append(prev + current[0])
+        prev = current
+        next_code += 1
+        width = (next_code - 1).bit_length()
+
+        decoded.append(current)
+        if len(decoded) >= DECODE_FLUSH_STRINGS:
+            text = "".join(decoded)
+            sink.write(text)
+            total_chars += len(text)
+            decoded = []
+
+    text = "".join(decoded)
+    sink.write(text)
+    return total_chars + len(text)
+
+
+def write_lzw_header(alphabet: Sequence[str], max_code_width: int) -> bytes:
+    """
+    Сериализуем параметры LZW в заголовок.
+
+    Формат (big-endian):
+      - 1 байт: максимальная ширина кода;
+      - uint32: размер следующего блока в байтах;
+      - символы алфавита по порядку их кодов в UTF-8.
+    """
+    if any(len(char) != 1 for char in alphabet):
+        raise ValueError("Алфавит должен состоять из одиночных символов")
+
+    symbols = "".join(alphabet).encode("utf-8")
+    return struct.pack(">BI", max_code_width, len(symbols)) + symbols
+
+
+def read_lzw_header(data: bytes | memoryview) -> tuple[str, int, int]:
+    """
+    Разбираем заголовок, записанный write_lzw_header.
+
+    Возвращает алфавит, максимальную ширину кода и размер заголовка в байтах.
+    """
+    max_code_width, symbols_size = struct.unpack_from(">BI", data, 0)
+    offset = struct.calcsize(">BI")
+    alphabet = bytes(data[offset:offset + symbols_size]).decode("utf-8")
+    return alphabet, max_code_width, offset + symbols_size
+
+
 def _compress_by_lzw(input_str: str) -> list[int]:
     """
     Реализуем алгоритм LZW для кодирования строки.
@@ -22,33 +220,40 @@ def _compress_by_lzw(input_str: str) -> list[int]:
       3. Если s+c содержится в словаре, s расширяется.
       4. Иначе выводим индекс s, добавляем в словарь новую строку s+c и начинаем с c.
 
+    Строки в словаре не хранятся: ключом служит пара (код s, индекс символа c),
+    упакованная в одно целое число, как ребро префиксного дерева.
+
     Возвращает список чисел.
     """
-    # Инициализируем словарь: для всех уникальных символов строки
-    dictionary: dict[str, int] = {}
-
     # Для воспроизводимости упорядочим символы
     unique_chars = sorted(set(input_str))
-    for nex_index, char in enumerate(unique_chars):
-        dictionary[char] = nex_index
+    symbol_index = {char: index for index, char in enumerate(unique_chars)}
+    alphabet_size = len(unique_chars)
 
-    nex_index = len(dictionary)  # Следующий номер для нового элемента словаря
+    dictionary: dict[int, int] = {}
+    nex_index = alphabet_size  # Следующий номер для нового элемента словаря
 
     output_codes: list[int] = []
-    s = ""  # Текущая обрабатываемая строка
+    s = -1  # Код текущей обрабатываемой строки, -1 — строка пуста
+
+    for char in input_str:
+        c = symbol_index[char]
+        if s < 0:
+            s = c
+            continue
 
-    for c in input_str:
-        s_plus = s + c
-        if s_plus in dictionary:
-            s = s_plus
+        key = s * alphabet_size + c
+        code = dictionary.get(key)
+        if code is not None:
+            s = code
         else:
-            output_codes.append(dictionary[s])
-            dictionary[s_plus] = nex_index
+            output_codes.append(s)
+            dictionary[key] = nex_index
             nex_index += 1
             s = c
 
     # Если осталась непустая строка s, выводим её код
-    if s:
-        output_codes.append(dictionary[s])
+    if s >= 0:
+        output_codes.append(s)
 
     return output_codes
@@ -0,0 +1,115 @@
+import io
+import random
+import sys
+import time
+from collections.abc import Callable
+
+from lwz import DEFAULT_MAX_CODE_WIDTH, lzw_decode_stream, lzw_encode_stream
+
+
+# Размер каждого проверочного входа по умолчанию, в мегабайтах
+DEFAULT_SIZE_MB = 100
+# Размер куска, которым генерируется и подаётся вход
+CHUNK_SIZE = 1 << 20
+
+LATIN = "abcdefghijklmnopqrstuvwxyz"
+CYRILLIC = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+
+
+class _CompareSink:
+    """Текстовый приёмник, сверяющий декодированный текст с исходными кусками."""
+
+    def __init__(self, chunks: list[str]):
+        self._chunks = chunks
+        self._chunk_index = 0
+        self._offset = 0
+
+    def write(self, text: str) -> None:
+        position = 0
+        while position < len(text):
+            if self._chunk_index >= len(self._chunks):
+                raise AssertionError("Декодировано больше символов, чем было закодировано")
+            chunk = self._chunks[self._chunk_index]
+            size = min(len(chunk) - self._offset, len(text) - position)
+            if text[position:position + size] != chunk[self._offset:self._offset + size]:
+                raise AssertionError("Декодированный текст не совпадает с исходным")
+            position += size
+            self._offset += size
+            if self._offset == len(chunk):
+                self._chunk_index += 1
+                self._offset = 0
+
+    def check_finished(self) -> None:
+        if self._chunk_index != len(self._chunks):
+            raise AssertionError("Декодировано меньше символов, чем было закодировано")
+
+
+def random_chunks(size: int, alphabet: str, seed: int) -> list[str]:
+    """Случайный текст над алфавитом."""
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choices(alphabet, k=min(CHUNK_SIZE, size - start)))
+        for start in range(0, size, CHUNK_SIZE)
+    ]
+
+
+def repeated_chunks(size: int, pattern: str) -> list[str]:
+    """Повторение шаблона: самые длинные фразы словаря."""
+    text = pattern * (CHUNK_SIZE // len(pattern) + 1)
+    return [text[:min(CHUNK_SIZE, size - start)] for start in range(0, size, CHUNK_SIZE)]
+
+
+def build_cases(size: int) -> list[tuple[str, Callable[[], list[str]], str]]:
+    """Набор проверок: (название, генератор кусков, алфавит)."""
+    with open("text.txt") as fp:
+        sample = fp.read()
+
+    return [
+        ("один символ", lambda: repeated_chunks(size, "a"), "a"),
+        ("чередование ab", lambda: repeated_chunks(size, "ab"), "ab"),
+        ("случайный, 2 символа", lambda: random_chunks(size, "ab", seed=1), "ab"),
+        ("случайный, латиница и кириллица", lambda: random_chunks(size, LATIN + CYRILLIC, seed=2), LATIN + CYRILLIC),
+        ("повтор text.txt", lambda: repeated_chunks(size, sample), "".join(sorted(set(sample)))),
+    ]
+
+
+def check_roundtrip(chunks: list[str], alphabet: str, max_code_width: int) -> dict[str, float]:
+    """Кодируем и декодируем вход, проверяем совпадение и замеряем скорость."""
+    input_bytes = sum(len(chunk.encode("utf-8")) for chunk in chunks)
+
+    encoded = io.BytesIO()
+    start = time.perf_counter()
+    lzw_encode_stream(chunks, alphabet, encoded, max_code_width)
+    encode_seconds = time.perf_counter() - start
+
+    sink = _CompareSink(chunks)
+    start = time.perf_counter()
+    lzw_decode_stream(encoded.getbuffer(), sink)
+    decode_seconds = time.perf_counter() - start
+    sink.check_finished()
+
+    return {
+        "input_mb": input_bytes / 1e6,
+        "ratio": input_bytes / len(encoded.getbuffer()),
+        "encode_mb_s": input_bytes / 1e6 / encode_seconds,
+        "decode_mb_s": input_bytes / 1e6 / decode_seconds,
+    }
+
+
+def main() -> None:
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE_MB
+    size = int(size_mb * 1_000_000)
+
+    for max_code_width in (12, DEFAULT_MAX_CODE_WIDTH):
+        print(f"\n# Максимальная ширина кода: {max_code_width} бит\n")
+        for name, make_chunks, alphabet in build_cases(size):
+            result = check_roundtrip(make_chunks(), alphabet, max_code_width)
+            print(
+                f"{name}: {result['input_mb']:.1f} МБ, сжатие ≈{result['ratio']:.3f}, "
+                f"кодирование {result['encode_mb_s']:.2f} МБ/с, "
+                f"декодирование {result['decode_mb_s']:.2f} МБ/с"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,16 @@
-from math import log2
-from collections import Counter
-
+from entropy import shannon_entropy
+from frequencies import count_char_ngrams
 from huffman_codes import huffman_encode
 from lwz import lzw_encode
 
 
-def collect_letter_frequencies(text: str) -> dict[str, int]:
-    counter = Counter(text)
-
-    frequencies = {}
-    for key, value in counter.items():
-        frequencies[key] = value
-
-    return frequencies
-
-
-def collect_pairs_frequencies(text: str) -> dict[str, int]:
-    pairs = [text[i] + text[i+1] for i in range(len(text) - 1)]
-    counter = Counter(pairs)
-
-    frequencies = {}
-    for key, value in counter.items():
-        frequencies[key] = value
-
-    return frequencies
-
-
-
 def main() -> None:
     with open("text.txt") as fp:
         text = fp.read()
     n = len(text)
 
-    letter_freq = collect_letter_frequencies(text)
-    pairs_freq = collect_pairs_frequencies(text)
+    letter_freq = count_char_ngrams("text.txt", 1)
+    pairs_freq = count_char_ngrams("text.txt", 2)
 
     print("# Частоты\n")
 
@@ -65,12 +42,12 @@ def main() -> None:
     print("\n# Вычисление энтропии по формуле Шеннона\n")
 
     # Количество информации на символ I = sum(p * log2(1/p)) = -sum(p * log2(p))
-    entropy = -sum((freq/n) * log2(freq/n) for freq in letter_freq.values())
+    entropy = shannon_entropy(letter_freq)
     shannon_total_bits = n * entropy
 
     print(f"Количество информации по формуле Шеннона: {shannon_total_bits}")
     print(f"Количество бит после сжатия по Хаффману: {huffman_total_bits}")
-    print(f"Количество бит после сжатия LZW: {huffman_total_bits}")
+    print(f"Количество бит после сжатия LZW: {lzw_code_total_bits}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+# Нормализация: пока интервал уже 2^24, из него выдвигается старший байт
+TOP = 1 << 24
+MASK_32 = (1 << 32) - 1
+# Предел суммы частот модели: интервал после деления на неё не должен обнуляться
+MAX_TOTAL = 1 << 16
+
+
+class RangeEncoder:
+    """
+    Интервальный (range) кодировщик с переносом, как в LZMA/PPMd.
+
+    Символ задаётся отрезком [start, start + size) из total. low хранит
+    33 бита, перенос в старший разряд дописывается к отложенным байтам 0xFF.
+    """
+
+    def __init__(self):
+        self.low = 0
+        self.range = MASK_32
+        self._cache = 0
+        self._cache_size = 1
+        self._out = bytearray()
+
+    def encode(self, start: int, size: int, total: int) -> None:
+        r = self.range // total
+        self.low += start * r
+        self.range = size * r
+        while self.range < TOP:
+            self.range <<= 8
+            self._shift_low()
+
+    def take_bytes(self) -> bytes:
+        """Забираем уже готовые байты."""
+        data = bytes(self._out)
+        self._out.clear()
+        return data
+
+    def finish(self) -> bytes:
+        """Выталкиваем остаток low и возвращаем последние байты."""
+        for _ in range(5):
+            self._shift_low()
+        return self.take_bytes()
+
+    def _shift_low(self) -> None:
+        if self.low < 0xFF000000 or self.low > MASK_32:
+            carry = self.low >> 32
+            temp = self._cache
+            while True:
+                self._out.append((temp + carry) & 0xFF)
+                temp = 0xFF
+                self._cache_size -= 1
+                if not self._cache_size:
+                    break
+            self._cache = (self.low >> 24) & 0xFF
+        self._cache_size += 1
+        self.low = (self.low << 8) & MASK_32
+
+
+class RangeDecoder:
+    """Декодер к RangeEncoder: сначала get_freq, затем decode с найденным отрезком."""
+
+    def __init__(self, data: bytes | memoryview):
+        self._data = memoryview(data).cast("B")
+        self._offset = 0
+        self.range = MASK_32
+        self.code = 0
+        for _ in range(5):
+            self.code = (self.code << 8) | self._next_byte()
+        self._r = 1
+
+    def get_freq(self, total: int) -> int:
+        """Определяем, в какую точку [0, total) попадает текущий код."""
+        self._r = self.range // total
+        return min(self.code // self._r, total - 1)
+
+    def decode(self, start: int, size: int) -> None:
+        """Сдвигаем состояние за отрезок [start, start + size), найденный по get_freq."""
+        self.code -= start * self._r
+        self.range = size * self._r
+        while self.range < TOP:
+            self.code = ((self.code << 8) | self._next_byte()) & MASK_32
+            self.range <<= 8
+
+    def _next_byte(self) -> int:
+        if self._offset >= len(self._data):
+            return 0
+        byte = self._data[self._offset]
+        self._offset += 1
+        return byte
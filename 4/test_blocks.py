@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from blocks import compress_file_blocks, decompress_file_blocks, read_block_index
+
+
+# Строки с переводами \r\n и одиночными \r: при чтении в текстовом режиме они бы изменились
+CRLF_TEXT = "первая строка\r\nвторая\rтретья\r\n\r\nlast line\r" * 1000
+
+
+@pytest.mark.parametrize("codec, shared_table", [("huffman", True), ("huffman", False), ("lzw", False)])
+def test_crlf_roundtrip(tmp_path, codec, shared_table):
+    source = tmp_path / "crlf.txt"
+    source.write_bytes(CRLF_TEXT.encode("utf-8"))
+    container = tmp_path / "crlf.dmlb"
+
+    compress_file_blocks(str(source), str(container), codec, block_size=4096, shared_table=shared_table, workers=1)
+    sink = io.StringIO(newline="")
+    chars = decompress_file_blocks(str(container), sink, workers=1)
+
+    assert chars == len(CRLF_TEXT)
+    assert sink.getvalue() == CRLF_TEXT
+
+
+def test_unknown_codec_id(tmp_path):
+    source = tmp_path / "text.txt"
+    source.write_text("abc", encoding="utf-8")
+    container = tmp_path / "text.dmlb"
+    compress_file_blocks(str(source), str(container), "lzw", workers=1)
+
+    data = bytearray(container.read_bytes())
+    data[4] = 200
+    with pytest.raises(ValueError, match="200"):
+        read_block_index(io.BytesIO(data))
+
+
+
+@pytest.mark.parametrize("codec, shared_table", [("huffman", True), ("huffman", False), ("lzw", False)])
+def test_empty_file_roundtrip(tmp_path, codec, shared_table):
+    source = tmp_path / "empty.txt"
+    source.write_bytes(b"")
+    container = tmp_path / "empty.dmlb"
+
+    blocks = compress_file_blocks(str(source), str(container), codec, shared_table=shared_table, workers=1)
+    sink = io.StringIO(newline="")
+
+    assert blocks == 0
+    assert decompress_file_blocks(str(container), sink, workers=1) == 0
+    assert sink.getvalue() == ""
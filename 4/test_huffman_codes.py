@@ -0,0 +1,22 @@
+import io
+
+import pytest
+
+from huffman_codes import (
+    build_code_table,
+    huffman_code_lengths,
+    huffman_encode_stream,
+    read_huffman_header,
+    write_huffman_header,
+)
+
+
+def test_huffman_encoder_rejects_missing_symbol():
+    with pytest.raises(ValueError):
+        huffman_encode_stream(["ab\r"], build_code_table({"a": 1, "b": 2}), io.BytesIO())
+
+
+def test_empty_frequencies_give_empty_table():
+    assert huffman_code_lengths({}) == {}
+    assert huffman_code_lengths({}, max_length=8) == {}
+    assert read_huffman_header(write_huffman_header({})) == ({}, 5)
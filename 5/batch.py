@@ -0,0 +1,102 @@
+from typing import List, Optional
+
+import numpy
+
+from main import build_syndrome_table, build_systematic_generator_matrix, polynomial_modulo
+
+
+# Ширина куска входа, обрабатываемого одной таблицей: 4096 записей помещаются в кэш L1
+DEFAULT_CHUNK_BITS = 12
+
+
+def build_linear_tables(
+    bit_images: List[int],
+    dtype: type = numpy.uint64,
+    chunk_bits: int = DEFAULT_CHUNK_BITS,
+) -> numpy.ndarray:
+    """Строит покусочные таблицы для линейного отображения над GF(2).
+
+    Линейное отображение задаётся образами отдельных битов входа: bit_images[i] —
+    образ числа 1 << i. Образ произвольного входа равен XOR образов его кусков
+    по chunk_bits бит, поэтому достаточно таблицы из 2^chunk_bits значений на кусок.
+
+    Args:
+        bit_images: Образы битов входа, начиная с младшего.
+        dtype: Тип элементов таблицы.
+        chunk_bits: Ширина куска входа.
+
+    Returns:
+        Массив формы (число кусков входа, 2^chunk_bits).
+    """
+    chunk_count = (len(bit_images) + chunk_bits - 1) // chunk_bits
+    tables = numpy.zeros((chunk_count, 1 << chunk_bits), dtype=dtype)
+    chunk_values = numpy.arange(1 << chunk_bits)
+
+    for bit, image in enumerate(bit_images):
+        chunk_index, bit_in_chunk = divmod(bit, chunk_bits)
+        has_bit = (chunk_values >> bit_in_chunk) & 1 == 1
+        tables[chunk_index, has_bit] ^= dtype(image)
+
+    return tables
+
+
+def apply_linear_tables(values: numpy.ndarray, tables: numpy.ndarray) -> numpy.ndarray:
+    """Применяет линейное отображение ко всему массиву: по одному обращению к таблице на кусок."""
+    values = numpy.asarray(values)
+    chunk_bits = tables.shape[1].bit_length() - 1
+    mask = values.dtype.type(tables.shape[1] - 1)
+    result = tables[0][values & mask]
+    for chunk_index in range(1, len(tables)):
+        result ^= tables[chunk_index][(values >> values.dtype.type(chunk_bits * chunk_index)) & mask]
+    return result
+
+
+class BatchCyclicCodec:
+    """Пакетное кодирование и декодирование циклического кода над массивами NumPy.
+
+    Кодирование, вычисление синдрома и исправление линейны над GF(2), поэтому
+    каждое сводится к нескольким табличным подстановкам по кускам слова для всего
+    массива сразу, без цикла по словам на Python.
+    """
+
+    def __init__(self, n: int, k: int, generator_polynomial: str, syndrome_table: Optional[List[int]] = None):
+        """
+        Args:
+            n: Длина кодового слова.
+            k: Длина информационного сообщения.
+            generator_polynomial: Порождающий полином в виде бинарной строки.
+            syndrome_table: Готовая таблица лидеров смежных классов (иначе строится).
+        """
+        self.n = n
+        self.k = k
+        self.dtype = numpy.uint32 if n <= 32 else numpy.uint64
+        generator = int(generator_polynomial, 2)
+
+        generator_matrix = build_systematic_generator_matrix(n, k, generator_polynomial)
+        # Строка 0 матрицы отвечает старшему биту сообщения
+        self.encode_tables = build_linear_tables(generator_matrix[::-1], self.dtype)
+        self.syndrome_tables = build_linear_tables(
+            [polynomial_modulo(1 << bit, generator) for bit in range(n)],
+            self.dtype,
+        )
+
+        if syndrome_table is None:
+            syndrome_table = build_syndrome_table(n, generator_polynomial)
+        self.syndrome_table = numpy.array(syndrome_table, dtype=self.dtype)
+
+    def encode(self, messages: numpy.ndarray) -> numpy.ndarray:
+        """Кодирует массив сообщений из k бит в массив кодовых слов из n бит."""
+        return apply_linear_tables(numpy.asarray(messages, dtype=self.dtype), self.encode_tables)
+
+    def syndromes(self, words: numpy.ndarray) -> numpy.ndarray:
+        """Вычисляет синдромы массива принятых слов."""
+        return apply_linear_tables(numpy.asarray(words, dtype=self.dtype), self.syndrome_tables)
+
+    def correct(self, words: numpy.ndarray) -> numpy.ndarray:
+        """Исправляет массив принятых слов по таблице лидеров смежных классов."""
+        words = numpy.asarray(words, dtype=self.dtype)
+        return words ^ self.syndrome_table[self.syndromes(words)]
+
+    def decode(self, words: numpy.ndarray) -> numpy.ndarray:
+        """Исправляет слова и извлекает сообщения из старших k бит систематического кода."""
+        return self.correct(words) >> self.dtype(self.n - self.k)
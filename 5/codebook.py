@@ -0,0 +1,107 @@
+from typing import Iterable, List, Tuple
+
+import numpy
+
+
+# Сколько расстояний (запросов на кодовые слова) считается за один проход
+DISTANCE_BLOCK = 1 << 23
+
+# Число единичных бит в каждом байте — для NumPy без bitwise_count
+_BYTE_POPCOUNT = numpy.array([bin(value).count("1") for value in range(256)], dtype=numpy.uint8)
+
+
+def popcount(values: numpy.ndarray) -> numpy.ndarray:
+    """Число единичных бит каждого элемента беззнакового массива."""
+    values = numpy.asarray(values)
+    if hasattr(numpy, "bitwise_count"):
+        return numpy.bitwise_count(values)
+    as_bytes = values.view(numpy.uint8).reshape(*values.shape, values.dtype.itemsize)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=numpy.uint8)
+
+
+def pack_words(values: Iterable[int], words: int) -> numpy.ndarray:
+    """Упаковывает целые числа в массив формы (len(values), words) из 64-битных частей (младшая первой)."""
+    values = list(values)
+    packed = numpy.empty((len(values), words), dtype=numpy.uint64)
+    for index in range(words):
+        packed[:, index] = [(value >> (64 * index)) & (2 ** 64 - 1) for value in values]
+    return packed
+
+
+class PackedCodebook:
+    """Кодовая книга в упакованном виде: массив NumPy (число слов, n / 64) из uint64.
+
+    Расстояния Хэмминга от запроса до всех кодовых слов считаются одним XOR
+    и одним popcount над массивом, без объектов Python на каждое кодовое слово.
+    """
+
+    def __init__(self, codewords: Iterable[int], n: int):
+        """
+        Args:
+            codewords: Кодовые слова в виде целых чисел.
+            n: Длина кодового слова.
+        """
+        self.n = n
+        self.words = (n + 63) // 64
+        self.codewords = pack_words(codewords, self.words)
+
+    @classmethod
+    def from_generator_matrix(cls, generator_matrix: List[int], n: int) -> "PackedCodebook":
+        """Строит книгу всех 2^k кодовых слов сразу в NumPy; слово с номером m кодирует сообщение m."""
+        codebook = cls([], n)
+        codewords = numpy.zeros((1, codebook.words), dtype=numpy.uint64)
+        # Строка 0 матрицы отвечает старшему биту сообщения, поэтому добавляется последней
+        for row in pack_words(reversed(generator_matrix), codebook.words):
+            codewords = numpy.concatenate((codewords, codewords ^ row))
+        codebook.codewords = codewords
+        return codebook
+
+    def __len__(self) -> int:
+        return len(self.codewords)
+
+    def codeword(self, index: int) -> int:
+        return sum(int(part) << (64 * position) for position, part in enumerate(self.codewords[index]))
+
+    def weights(self) -> numpy.ndarray:
+        """Веса всех кодовых слов."""
+        return popcount(self.codewords).sum(axis=1, dtype=numpy.intp)
+
+    def minimum_distance(self) -> int:
+        """Минимальный ненулевой вес — минимальное расстояние линейного кода."""
+        weights = self.weights()
+        nonzero = weights[weights > 0]
+        return int(nonzero.min()) if len(nonzero) else 0
+
+    def distances(self, word: int) -> numpy.ndarray:
+        """Расстояния Хэмминга от word до всех кодовых слов."""
+        query = pack_words([word], self.words)[0]
+        return popcount(self.codewords ^ query).sum(axis=1, dtype=numpy.intp)
+
+    def nearest(self, received_words: Iterable[int]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Ищет ближайшее кодовое слово для каждого принятого слова.
+
+        Запросы обрабатываются блоками так, чтобы матрица расстояний блока
+        содержала не больше DISTANCE_BLOCK элементов.
+
+        Returns:
+            Кортеж (номера ближайших кодовых слов, расстояния до них); при равных
+            расстояниях берётся первое слово, как в find_closest_codeword.
+        """
+        queries = pack_words(received_words, self.words)
+        indices = numpy.empty(len(queries), dtype=numpy.intp)
+        distances = numpy.empty(len(queries), dtype=numpy.intp)
+        step = max(1, DISTANCE_BLOCK // max(len(self.codewords), 1))
+
+        for start in range(0, len(queries), step):
+            block = queries[start:start + step]
+            block_distances = popcount(block[:, None, :] ^ self.codewords[None, :, :]).sum(axis=2, dtype=numpy.intp)
+            indices[start:start + step] = block_distances.argmin(axis=1)
+            distances[start:start + step] = block_distances[
+                numpy.arange(len(block)), indices[start:start + step]
+            ]
+        return indices, distances
+
+    def closest_codewords(self, received_words: Iterable[int]) -> List[int]:
+        """Ближайшие кодовые слова в виде целых чисел (пакетный аналог find_closest_codeword)."""
+        indices, _ = self.nearest(received_words)
+        return [self.codeword(index) for index in indices]
@@ -0,0 +1,136 @@
+import mmap
+
+import numpy
+
+from batch import apply_linear_tables, build_linear_tables
+from main import polynomial_modulo
+
+
+# Длина блока в байтах, остаток которого считается одной табличной свёрткой
+DEFAULT_BLOCK_BYTES = 64
+# Сколько блоков обрабатывается за один проход NumPy (сегмент 64 * 2^14 = 1 МБ)
+SEGMENT_LEVELS = 14
+
+
+class PolynomialRemainder:
+    """Табличное вычисление остатков по модулю порождающего полинома над GF(2) (CRC).
+
+    Для буфера байт data вычисляется (data(x) * x^r) mod g(x), где r — степень g:
+    это CRC без начального значения и финального XOR, он же проверочная часть
+    систематического циклического кода.
+
+    Остаток линеен по входу, поэтому буфер режется на блоки по block_bytes байт,
+    и остаток блока равен XOR табличных значений его байтов (по таблице из 256
+    значений на каждую позицию байта в блоке — обобщение slicing-by-N).
+    Остатки блоков попарно сворачиваются в дерево: левый умножается на x^(8 * длина
+    правого) по своим таблицам. Всё это делается NumPy над целым сегментом,
+    а на Python остаётся цикл по сегментам размером в мегабайт.
+    """
+
+    def __init__(self, generator_polynomial: str, block_bytes: int = DEFAULT_BLOCK_BYTES):
+        """
+        Args:
+            generator_polynomial: Порождающий полином в виде бинарной строки.
+            block_bytes: Длина блока в байтах.
+        """
+        self.generator = int(generator_polynomial, 2)
+        self.degree = self.generator.bit_length() - 1
+        if not 1 <= self.degree <= 64:
+            raise ValueError("Степень порождающего полинома должна быть от 1 до 64")
+
+        self.block_bytes = block_bytes
+        self.dtype = numpy.uint32 if self.degree <= 32 else numpy.uint64
+        self.segment_bytes = block_bytes << SEGMENT_LEVELS
+
+        # Образы битов: бит j байта i блока даёт x^(8 * (block_bytes - 1 - i) + j + r) mod g
+        bit_images = []
+        image = polynomial_modulo(1 << self.degree, self.generator)
+        for _ in range(8 * block_bytes):
+            bit_images.append(image)
+            image = self._times_x(image)
+        # Позиция 0 в блоке — старший байт; таблицы всех позиций лежат подряд
+        self.block_tables = build_linear_tables(bit_images, self.dtype, chunk_bits=8)[::-1].ravel()
+        self._table_offsets = numpy.arange(0, 256 * block_bytes, 256, dtype=numpy.intp)
+
+        # Таблицы умножения остатка на x^(8 * block_bytes * 2^level) для свёртки дерева
+        self.level_tables = []
+        for level in range(SEGMENT_LEVELS):
+            factor = self._power_of_x(8 * (block_bytes << level))
+            self.level_tables.append(build_linear_tables(
+                [self._multiply(1 << bit, factor) for bit in range(self.degree)],
+                self.dtype,
+                chunk_bits=8,
+            ))
+        self._segment_factor = self._power_of_x(8 * self.segment_bytes)
+
+    def crc(self, data: bytes | memoryview, crc: int = 0) -> int:
+        """Вычисляет остаток для data; crc — остаток предыдущей части, если вход идёт по частям."""
+        buffer = numpy.frombuffer(memoryview(data).cast("B"), dtype=numpy.uint8)
+        for start in range(0, len(buffer), self.segment_bytes):
+            segment = buffer[start:start + self.segment_bytes]
+            if len(segment) == self.segment_bytes:
+                factor = self._segment_factor
+            else:
+                factor = self._power_of_x(8 * len(segment))
+            crc = self._multiply(crc, factor) ^ self._segment_crc(segment)
+        return crc
+
+    def crc_file(self, path: str) -> int:
+        """Вычисляет остаток для содержимого файла, отображая его в память."""
+        with open(path, "rb") as fp:
+            if fp.seek(0, 2) == 0:
+                return 0
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    return self.crc(view)
+                finally:
+                    view.release()
+
+    def encode_systematic(self, message: int, k: int) -> int:
+        """Кодирует сообщение из k бит систематическим циклическим кодом: message * x^r + остаток."""
+        data = message.to_bytes((k + 7) // 8, "big")
+        return (message << self.degree) | self.crc(data)
+
+    def _segment_crc(self, segment: numpy.ndarray) -> int:
+        """Остаток одного сегмента: табличная свёртка блоков и попарное слияние их остатков."""
+        block_count = -(-len(segment) // self.block_bytes)
+        block_count = 1 << (block_count - 1).bit_length()
+        # Ведущие нулевые байты не меняют остаток, поэтому дополняем сегмент спереди
+        padded = numpy.zeros(block_count * self.block_bytes, dtype=numpy.uint8)
+        padded[len(padded) - len(segment):] = segment
+        blocks = padded.reshape(block_count, self.block_bytes)
+
+        crcs = numpy.bitwise_xor.reduce(self.block_tables[blocks + self._table_offsets], axis=1)
+        level = 0
+        while len(crcs) > 1:
+            crcs = apply_linear_tables(crcs[0::2], self.level_tables[level]) ^ crcs[1::2]
+            level += 1
+        return int(crcs[0])
+
+    def _times_x(self, value: int) -> int:
+        value <<= 1
+        if value >> self.degree & 1:
+            value ^= self.generator
+        return value
+
+    def _multiply(self, a: int, b: int) -> int:
+        """Произведение двух остатков по модулю порождающего полинома."""
+        result = 0
+        while b:
+            if b & 1:
+                result ^= a
+            b >>= 1
+            a = self._times_x(a)
+        return result
+
+    def _power_of_x(self, exponent: int) -> int:
+        """x^exponent mod g возведением в квадрат."""
+        result = polynomial_modulo(1, self.generator)
+        base = polynomial_modulo(2, self.generator)
+        while exponent:
+            if exponent & 1:
+                result = self._multiply(result, base)
+            base = self._multiply(base, base)
+            exponent >>= 1
+        return result
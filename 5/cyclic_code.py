@@ -0,0 +1,154 @@
+import json
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from batch import BatchCyclicCodec
+from main import (
+    build_syndrome_table,
+    build_systematic_generator_matrix,
+    compute_syndrome,
+    encode_message,
+    polynomial_modulo,
+    syndrome_decode,
+)
+from weights import dual_generator_matrix, minimum_distance_from_distribution, weight_distribution
+
+
+# Сколько построенных таблиц (матриц, таблиц синдромов, спектров) держится в памяти
+MEMORY_CACHE_SIZE = 128
+
+
+class CyclicCode:
+    """Циклический код (n, k) с порождающим полиномом g.
+
+    Порождающая и проверочная матрицы, таблица синдромов и весовой спектр
+    строятся при первом обращении. Построенное хранится в общем для всех
+    экземпляров LRU-кэше по (n, k, g) и, если задан cache_dir, на диске,
+    поэтому повторное создание кода с теми же параметрами ничего не пересчитывает.
+    """
+
+    def __init__(self, n: int, k: int, generator_polynomial: str, cache_dir: Optional[str] = None):
+        """
+        Args:
+            n: Длина кодового слова.
+            k: Длина информационного сообщения.
+            generator_polynomial: Порождающий полином в виде бинарной строки.
+            cache_dir: Каталог дискового кэша (без дискового кэша, если None).
+
+        Raises:
+            ValueError: Если степень g не равна n - k или g не делит x^n - 1.
+        """
+        generator = int(generator_polynomial, 2)
+        if not 0 < k < n:
+            raise ValueError("Должно выполняться 0 < k < n")
+        if generator.bit_length() - 1 != n - k:
+            raise ValueError(f"Степень порождающего полинома должна быть n - k = {n - k}")
+        # Над GF(2) x^n - 1 = x^n + 1
+        if polynomial_modulo((1 << n) | 1, generator) != 0:
+            raise ValueError(f"Полином {generator_polynomial} не делит x^{n} - 1")
+
+        self.n = n
+        self.k = k
+        self.generator_polynomial = format(generator, "b")
+        self.generator = generator
+        self.cache_dir = cache_dir
+
+    def __repr__(self) -> str:
+        return f"CyclicCode(n={self.n}, k={self.k}, generator_polynomial='{self.generator_polynomial}')"
+
+    @property
+    def generator_matrix(self) -> List[int]:
+        """Систематическая порождающая матрица (k строк по n бит)."""
+        return self._artifact("generator_matrix")
+
+    @property
+    def parity_check_matrix(self) -> List[int]:
+        """Проверочная матрица (n - k строк по n бит): порождающая матрица дуального кода."""
+        return self._artifact("parity_check_matrix")
+
+    @property
+    def syndrome_table(self) -> List[int]:
+        """Таблица лидеров смежных классов по синдрому."""
+        return self._artifact("syndrome_table")
+
+    @property
+    def weight_distribution(self) -> List[int]:
+        """Весовой спектр кода: A[w] — число кодовых слов веса w."""
+        return self._artifact("weight_distribution")
+
+    @property
+    def minimum_distance(self) -> int:
+        return minimum_distance_from_distribution(self.weight_distribution)
+
+    @property
+    def batch_codec(self) -> BatchCyclicCodec:
+        """Пакетный кодек NumPy с общей таблицей синдромов."""
+        return _batch_codec(self.n, self.k, self.generator_polynomial, self.cache_dir)
+
+    def encode(self, message: int) -> int:
+        return encode_message(message, self.generator_matrix)
+
+    def syndrome(self, received_word: int) -> int:
+        return compute_syndrome(received_word, self.generator)
+
+    def decode(self, received_word: int) -> int:
+        """Исправляет принятое слово и извлекает сообщение из старших k бит."""
+        return syndrome_decode(received_word, self.syndrome_table, self.generator) >> (self.n - self.k)
+
+    def _artifact(self, name: str):
+        return _artifact(self.n, self.k, self.generator_polynomial, name, self.cache_dir)
+
+
+def clear_memory_cache() -> None:
+    """Очищает кэш построенных таблиц в памяти (дисковый кэш не затрагивается)."""
+    _artifact.cache_clear()
+    _batch_codec.cache_clear()
+
+
+def _build_parity_check_matrix(n: int, k: int, generator_polynomial: str, cache_dir: Optional[str]) -> List[int]:
+    return dual_generator_matrix(_artifact(n, k, generator_polynomial, "generator_matrix", cache_dir), n)
+
+
+def _build_weight_distribution(n: int, k: int, generator_polynomial: str, cache_dir: Optional[str]) -> List[int]:
+    return weight_distribution(_artifact(n, k, generator_polynomial, "generator_matrix", cache_dir), n)
+
+
+# Как строится каждая таблица: (n, k, g, cache_dir) -> значение
+_BUILDERS: Dict[str, Callable[[int, int, str, Optional[str]], List[int]]] = {
+    "generator_matrix": lambda n, k, g, cache_dir: build_systematic_generator_matrix(n, k, g),
+    "parity_check_matrix": _build_parity_check_matrix,
+    "syndrome_table": lambda n, k, g, cache_dir: build_syndrome_table(n, g),
+    "weight_distribution": _build_weight_distribution,
+}
+
+
+@lru_cache(maxsize=MEMORY_CACHE_SIZE)
+def _artifact(n: int, k: int, generator_polynomial: str, name: str, cache_dir: Optional[str]) -> List[int]:
+    """Берёт таблицу из дискового кэша или строит её и сохраняет туда."""
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"{n}_{k}_{generator_polynomial}", f"{name}.json")
+        try:
+            with open(path, encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            pass
+
+    value = _BUILDERS[name](n, k, generator_polynomial, cache_dir)
+
+    if path is not None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Запись через временный файл, чтобы параллельные процессы не прочли недописанный
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as fp:
+            json.dump(value, fp)
+        os.replace(temporary_path, path)
+    return value
+
+
+@lru_cache(maxsize=MEMORY_CACHE_SIZE)
+def _batch_codec(n: int, k: int, generator_polynomial: str, cache_dir: Optional[str]) -> BatchCyclicCodec:
+    return BatchCyclicCodec(
+        n, k, generator_polynomial, _artifact(n, k, generator_polynomial, "syndrome_table", cache_dir),
+    )
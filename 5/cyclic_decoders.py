@@ -0,0 +1,163 @@
+import random
+import time
+from itertools import combinations
+from typing import Callable, Optional, Set
+
+from main import (
+    build_syndrome_table,
+    build_systematic_generator_matrix,
+    encode_message,
+    find_closest_codeword,
+    polynomial_modulo,
+    syndrome_decode,
+)
+
+
+def build_meggitt_patterns(n: int, generator_polynomial: str, t: int) -> Set[int]:
+    """Строит синдромы исправляемых ошибок со старшим разрядом x^(n-1) для декодера Меггитта.
+
+    Хранятся только ошибки веса не больше t, затрагивающие старший разряд:
+    остальные получаются циклическими сдвигами. Их число — сумма C(n - 1, w - 1)
+    по w от 1 до t, то есть растёт как n^(t-1), а не как 2^(n-k).
+
+    Args:
+        n: Длина кодового слова.
+        generator_polynomial: Порождающий полином в виде бинарной строки.
+        t: Число исправляемых ошибок.
+
+    Returns:
+        Множество синдромов.
+    """
+    generator = int(generator_polynomial, 2)
+    top = 1 << (n - 1)
+    patterns = set()
+    for weight in range(t):
+        for positions in combinations(range(n - 1), weight):
+            error = top
+            for position in positions:
+                error |= 1 << position
+            patterns.add(polynomial_modulo(error, generator))
+    return patterns
+
+
+def meggitt_decode(received_word: int, n: int, generator: int, patterns: Set[int]) -> Optional[int]:
+    """Декодер Меггитта: исправляет ошибки по одному разряду, циклически сдвигая синдром.
+
+    Синдром x^i * r(x) mod (x^n - 1) равен x^i * s(x) mod g(x), поэтому слово не
+    сдвигается: на шаге i проверяется, есть ли ошибка в разряде n - 1 - i исходного
+    слова, и при исправлении из синдрома вычитается синдром x^(n-1).
+
+    Args:
+        received_word: Принятое слово.
+        n: Длина кодового слова.
+        generator: Порождающий полином в виде целого числа.
+        patterns: Результат build_meggitt_patterns.
+
+    Returns:
+        Исправленное кодовое слово или None, если ошибку исправить не удалось.
+    """
+    degree = generator.bit_length() - 1
+    top_syndrome = polynomial_modulo(1 << (n - 1), generator)
+    syndrome = polynomial_modulo(received_word, generator)
+
+    for shift in range(n):
+        if not syndrome:
+            return received_word
+        if syndrome in patterns:
+            received_word ^= 1 << (n - 1 - shift)
+            syndrome ^= top_syndrome
+        syndrome <<= 1
+        if syndrome >> degree & 1:
+            syndrome ^= generator
+
+    return received_word if not syndrome else None
+
+
+def error_trapping_decode(received_word: int, n: int, generator: int, t: int) -> Optional[int]:
+    """Декодер с вылавливанием ошибок.
+
+    Если все ошибки (не больше t) укладываются в n - k подряд идущих разрядов
+    (циклически), то при некотором сдвиге i они попадают в проверочную часть,
+    и синдром x^i * r(x) совпадает с самой ошибкой — его вес не больше t.
+    Такой синдром сдвигается обратно на i разрядов и прибавляется к слову.
+
+    Args:
+        received_word: Принятое слово.
+        n: Длина кодового слова.
+        generator: Порождающий полином в виде целого числа.
+        t: Число исправляемых ошибок.
+
+    Returns:
+        Исправленное кодовое слово или None, если ошибки не удалось выловить.
+    """
+    degree = generator.bit_length() - 1
+    mask = (1 << n) - 1
+    syndrome = polynomial_modulo(received_word, generator)
+
+    for shift in range(n):
+        if syndrome.bit_count() <= t:
+            # Циклический сдвиг ошибки на shift разрядов вправо
+            error = ((syndrome >> shift) | (syndrome << (n - shift))) & mask
+            return received_word ^ error
+        syndrome <<= 1
+        if syndrome >> degree & 1:
+            syndrome ^= generator
+
+    return None
+
+
+def _time_per_word(decode: Callable[[int], Optional[int]], words: list) -> float:
+    start = time.perf_counter()
+    for word in words:
+        decode(word)
+    return (time.perf_counter() - start) / len(words)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    # (n, k, порождающий полином, t): Голей, БЧХ (31, 21), коды Хэмминга
+    codes = [
+        (23, 12, "101011100011", 3),
+        (31, 21, "11101101001", 2),
+        (127, 120, "10001001", 1),
+        (1023, 1013, "10000001001", 1),
+    ]
+
+    print("Время декодирования одного слова, мкс:")
+    for n, k, generator_polynomial, t in codes:
+        generator = int(generator_polynomial, 2)
+        generator_matrix = build_systematic_generator_matrix(n, k, generator_polynomial)
+        patterns = build_meggitt_patterns(n, generator_polynomial, t)
+
+        codewords = [encode_message(rng.getrandbits(k), generator_matrix) for _ in range(200)]
+        received = [
+            codeword ^ sum(1 << position for position in rng.sample(range(n), t))
+            for codeword in codewords
+        ]
+
+        meggitt = [meggitt_decode(word, n, generator, patterns) for word in received]
+        trapping = [error_trapping_decode(word, n, generator, t) for word in received]
+        timings = {
+            "Меггитт": _time_per_word(lambda word: meggitt_decode(word, n, generator, patterns), received),
+            "вылавливание": _time_per_word(lambda word: error_trapping_decode(word, n, generator, t), received),
+        }
+        if n - k <= 16:
+            syndrome_table = build_syndrome_table(n, generator_polynomial)
+            timings["таблица синдромов"] = _time_per_word(
+                lambda word: syndrome_decode(word, syndrome_table, generator), received,
+            )
+        if k <= 12:
+            all_codewords = [encode_message(message, generator_matrix) for message in range(1 << k)]
+            timings["перебор"] = _time_per_word(
+                lambda word: find_closest_codeword(word, all_codewords), received[:20],
+            )
+
+        print(f"\nКод ({n}, {k}), t = {t}, шаблонов Меггитта: {len(patterns)}")
+        print(f"  Исправлено Меггиттом: {sum(a == b for a, b in zip(meggitt, codewords))} из {len(codewords)}")
+        print(f"  Исправлено вылавливанием: {sum(a == b for a, b in zip(trapping, codewords))} из {len(codewords)}")
+        for name, seconds in timings.items():
+            print(f"  {name}: {seconds * 1e6:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from typing import List, Tuple, Optional
+from itertools import combinations
+from typing import Iterable, Iterator, List, Tuple, Optional
 
 
 def polynomial_modulo(dividend: int, divisor: int) -> int:
@@ -67,7 +68,7 @@ def encode_message(message: int, generator_matrix: List[int]) -> int:
 
 def count_set_bits(value: int) -> int:
     """Подсчитывает количество установленных битов в числе."""
-    return bin(value).count("1")
+    return value.bit_count()
 
 
 def calculate_minimum_distance(codewords: List[int]) -> int:
@@ -121,6 +122,65 @@ def find_closest_codeword(distorted_word: int, codewords: List[int]) -> Optional
     return closest
 
 
+def compute_syndrome(received_word: int, generator: int) -> int:
+    """Вычисляет синдром принятого слова — остаток от деления на порождающий полином.
+
+    У кодового слова циклического кода синдром нулевой, у искажённого
+    он зависит только от вектора ошибки.
+    """
+    return polynomial_modulo(received_word, generator)
+
+
+def build_syndrome_table(n: int, generator_polynomial: str) -> List[int]:
+    """Строит таблицу лидеров смежных классов для синдромного декодирования.
+
+    Векторы ошибок перебираются в порядке возрастания веса, и каждому
+    синдрому ставится в соответствие первый (наименьший по весу) вектор с таким
+    синдромом. Синдром линеен, поэтому он считается как XOR синдромов
+    отдельных битов без деления полиномов.
+
+    Args:
+        n: Длина кодового слова.
+        generator_polynomial: Порождающий полином в виде бинарной строки.
+
+    Returns:
+        Список из 2^(n-k) векторов ошибок, индексируемый синдромом.
+    """
+    generator = int(generator_polynomial, 2)
+    table_size = 1 << (generator.bit_length() - 1)
+    bit_syndromes = [polynomial_modulo(1 << position, generator) for position in range(n)]
+
+    table = [-1] * table_size
+    table[0] = 0
+    filled = 1
+
+    for weight in range(1, n + 1):
+        for positions in combinations(range(n), weight):
+            syndrome = 0
+            error = 0
+            for position in positions:
+                syndrome ^= bit_syndromes[position]
+                error |= 1 << position
+            if table[syndrome] < 0:
+                table[syndrome] = error
+                filled += 1
+                if filled == table_size:
+                    return table
+
+    return table
+
+
+def syndrome_decode(received_word: int, syndrome_table: List[int], generator: int) -> int:
+    """Исправляет принятое слово по таблице лидеров смежных классов за O(1) обращений к таблице."""
+    return received_word ^ syndrome_table[polynomial_modulo(received_word, generator)]
+
+
+def syndrome_decode_stream(received_words: Iterable[int], syndrome_table: List[int], generator: int) -> Iterator[int]:
+    """Исправляет поток принятых слов, не накапливая их в памяти."""
+    for received_word in received_words:
+        yield received_word ^ syndrome_table[polynomial_modulo(received_word, generator)]
+
+
 def analyze_error_case(original_cw: int, received_word: int, codewords: List[int], t_correct: int, t_detect: int, CODEWORD_LENGTH: int):
     """Анализирует случай ошибки и выводит результаты проверки."""
     is_valid = is_valid_codeword(received_word, codewords)
@@ -203,6 +263,15 @@ def main() -> None:
     print(f"Вектор ошибки:      {int_to_binary_string(error_vector_2, CODEWORD_LENGTH)}")
     analyze_error_case(cw_example, received_word_2, all_codewords, t_correct, t_detect, CODEWORD_LENGTH)
 
+    # Синдромное декодирование того же слова: таблица из 2^(n-k) лидеров смежных классов
+    generator = int(GENERATOR_POLYNOMIAL, 2)
+    syndrome_table = build_syndrome_table(CODEWORD_LENGTH, GENERATOR_POLYNOMIAL)
+    syndrome = compute_syndrome(received_word_2, generator)
+    corrected = syndrome_decode(received_word_2, syndrome_table, generator)
+    print(f"  Синдром: {int_to_binary_string(syndrome, CODEWORD_LENGTH - MESSAGE_LENGTH)}")
+    print(f"  Синдромный декодер: {int_to_binary_string(corrected, CODEWORD_LENGTH)}"
+          f" ({'совпадает' if corrected == cw_example else 'не совпадает'} с исходным)")
+
     # Пример 2: Ошибка весом 4 (обнаруживается, но не исправляется)
     error_vector_4 = int("11110000000000000000000", 2)  # Первые 4 бита
     received_word_4 = cw_example ^ error_vector_4
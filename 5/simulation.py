@@ -0,0 +1,154 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy
+
+from batch import BatchCyclicCodec
+from codebook import popcount
+
+
+# Число испытаний, обрабатываемых за один проход NumPy
+DEFAULT_BATCH_SIZE = 1 << 18
+# Квантиль нормального распределения для 95% доверительного интервала
+CONFIDENCE_Z = 1.96
+
+
+class ErrorRate(NamedTuple):
+    """Результат моделирования при одной вероятности ошибки в канале."""
+
+    probability: float
+    trials: int
+    block_errors: int
+    bit_errors: int
+    block_error_rate: float
+    block_interval: Tuple[float, float]
+    bit_error_rate: float
+    bit_interval: Tuple[float, float]
+
+
+def wilson_interval(errors: int, trials: int, z: float = CONFIDENCE_Z) -> Tuple[float, float]:
+    """Доверительный интервал Уилсона для доли errors / trials (корректен и при нуле ошибок)."""
+    if trials == 0:
+        return 0.0, 1.0
+    rate = errors / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    half_width = z * sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def random_error_patterns(rng: numpy.random.Generator, count: int, n: int, probability: float, dtype: type) -> numpy.ndarray:
+    """Векторы ошибок двоичного симметричного канала: каждый из n бит меняется с вероятностью probability."""
+    # float64: у float32 шаг 2^-24, и малые вероятности округлялись бы с заметным смещением
+    flips = rng.random((count, n)) < probability
+    packed = numpy.packbits(flips, axis=1, bitorder="little")
+    width = numpy.dtype(dtype).itemsize
+    padded = numpy.zeros((count, width), dtype=numpy.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view(numpy.dtype(dtype).newbyteorder("<")).ravel().astype(dtype)
+
+
+def simulate_channel(
+    codec: BatchCyclicCodec,
+    probability: float,
+    trials: int,
+    seed: Optional[numpy.random.SeedSequence] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[int, int]:
+    """Передаёт trials случайных сообщений через двоичный симметричный канал и декодирует их.
+
+    Returns:
+        Кортеж (число неверно декодированных сообщений, число неверных информационных бит).
+    """
+    rng = numpy.random.default_rng(seed)
+    block_errors = 0
+    bit_errors = 0
+    for start in range(0, trials, batch_size):
+        count = min(batch_size, trials - start)
+        messages = rng.integers(0, 1 << codec.k, size=count, dtype=codec.dtype)
+        received = codec.encode(messages) ^ random_error_patterns(rng, count, codec.n, probability, codec.dtype)
+        wrong_bits = codec.decode(received) ^ messages
+        block_errors += int(numpy.count_nonzero(wrong_bits))
+        bit_errors += int(popcount(wrong_bits).sum(dtype=numpy.int64))
+    return block_errors, bit_errors
+
+
+def simulate_error_rates(
+    codec: BatchCyclicCodec,
+    probabilities: Sequence[float],
+    trials: int,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    tasks_per_probability: Optional[int] = None,
+) -> List[ErrorRate]:
+    """Строит кривые вероятности ошибки на блок и на бит для ряда вероятностей ошибки в канале.
+
+    Испытания каждой вероятности делятся на задачи, которые выполняются в отдельных
+    процессах. Каждая задача получает свой поток случайных чисел от
+    SeedSequence(seed).spawn, поэтому потоки независимы, а результат при заданных
+    seed и tasks_per_probability не зависит от числа процессов.
+
+    Args:
+        codec: Пакетный кодек циклического кода.
+        probabilities: Вероятности ошибки в бите канала.
+        trials: Число переданных сообщений на каждую вероятность.
+        workers: Число процессов.
+        seed: Начальное значение генератора (случайное, если None).
+        tasks_per_probability: На сколько задач делятся испытания (по умолчанию — по числу процессов).
+
+    Returns:
+        Список результатов в порядке probabilities.
+    """
+    tasks_per_probability = tasks_per_probability or max(workers, 1)
+    seeds = numpy.random.SeedSequence(seed).spawn(len(probabilities) * tasks_per_probability)
+    shares = [
+        trials // tasks_per_probability + (task < trials % tasks_per_probability)
+        for task in range(tasks_per_probability)
+    ]
+
+    jobs = [
+        (probability, share, seeds[index * tasks_per_probability + task])
+        for index, probability in enumerate(probabilities)
+        for task, share in enumerate(shares)
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(simulate_channel, *zip(*[(codec, *job) for job in jobs])))
+    else:
+        counts = [simulate_channel(codec, *job) for job in jobs]
+
+    results = []
+    for index, probability in enumerate(probabilities):
+        task_counts = counts[index * tasks_per_probability:(index + 1) * tasks_per_probability]
+        block_errors = sum(block for block, _ in task_counts)
+        bit_errors = sum(bit for _, bit in task_counts)
+        bits = trials * codec.k
+        results.append(ErrorRate(
+            probability=probability,
+            trials=trials,
+            block_errors=block_errors,
+            bit_errors=bit_errors,
+            block_error_rate=block_errors / trials if trials else 0.0,
+            block_interval=wilson_interval(block_errors, trials),
+            bit_error_rate=bit_errors / bits if bits else 0.0,
+            bit_interval=wilson_interval(bit_errors, bits),
+        ))
+    return results
+
+
+def main() -> None:
+    codec = BatchCyclicCodec(23, 12, "101011100011")
+    probabilities = [0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2]
+
+    print("p       | ошибка на блок (95% ДИ)               | ошибка на бит (95% ДИ)")
+    for rate in simulate_error_rates(codec, probabilities, trials=10 ** 6, seed=0):
+        print(
+            f"{rate.probability:<7} | {rate.block_error_rate:.3e} "
+            f"[{rate.block_interval[0]:.3e}, {rate.block_interval[1]:.3e}] | {rate.bit_error_rate:.3e} "
+            f"[{rate.bit_interval[0]:.3e}, {rate.bit_interval[1]:.3e}]"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy
+
+from codebook import popcount
+
+
+# Число строк порождающей матрицы, все комбинации которых лежат в одном массиве NumPy
+DEFAULT_SPAN_BITS = 16
+# На сколько задач на процесс делится перебор по префиксу сообщения
+TASKS_PER_WORKER = 4
+
+
+def weight_distribution(
+    generator_matrix: List[int],
+    n: int,
+    workers: int = 1,
+    use_dual: Optional[bool] = None,
+    span_bits: int = DEFAULT_SPAN_BITS,
+) -> List[int]:
+    """Вычисляет весовой спектр линейного кода без построения списка кодовых слов.
+
+    Кодовые слова перебираются кодом Грея: младшие span_bits строк матрицы дают
+    массив всех своих комбинаций, а каждый шаг по остальным строкам меняет одну
+    строку, то есть стоит одного XOR на кодовое слово над всем массивом.
+    Если n - k < k, дешевле перебрать дуальный код и применить тождество Мак-Вильямс.
+
+    Args:
+        generator_matrix: Порождающая матрица в виде списка строк-целых чисел.
+        n: Длина кодового слова.
+        workers: Число процессов; перебор делится между ними по префиксу сообщения.
+        use_dual: Считать через дуальный код (по умолчанию — если n - k < k).
+        span_bits: Сколько строк перебирается одним массивом.
+
+    Returns:
+        Список A длины n + 1, где A[w] — число кодовых слов веса w.
+    """
+    k = len(generator_matrix)
+    if use_dual is None:
+        use_dual = n - k < k
+    if use_dual:
+        dual_distribution = weight_distribution(
+            dual_generator_matrix(generator_matrix, n), n, workers, use_dual=False, span_bits=span_bits,
+        )
+        return macwilliams_transform(dual_distribution, n)
+
+    if workers <= 1:
+        return _enumerate_weights(generator_matrix, n, 0, span_bits)
+
+    # Старшие строки фиксируются: каждая задача перебирает свой смежный класс
+    prefix_bits = min(max(k - span_bits, 0), (TASKS_PER_WORKER * workers - 1).bit_length())
+    prefix_rows, rows = generator_matrix[:prefix_bits], generator_matrix[prefix_bits:]
+    bases = [_combination_xor(prefix_rows, mask) for mask in range(1 << prefix_bits)]
+
+    distribution = [0] * (n + 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        tasks = executor.map(
+            _enumerate_weights,
+            [rows] * len(bases),
+            [n] * len(bases),
+            bases,
+            [span_bits] * len(bases),
+        )
+        for partial in tasks:
+            distribution = [total + count for total, count in zip(distribution, partial)]
+    return distribution
+
+
+def macwilliams_transform(dual_distribution: List[int], n: int) -> List[int]:
+    """Весовой спектр кода по спектру дуального: A[w] = sum(B[j] * K_w(j)) / |C⊥|.
+
+    K_w(j) — многочлены Кравчука: K_w(j) = sum((-1)^s * C(j, s) * C(n - j, w - s)).
+    """
+    dual_size = sum(dual_distribution)
+    return [
+        sum(
+            count * sum((-1) ** s * comb(j, s) * comb(n - j, w - s) for s in range(w + 1))
+            for j, count in enumerate(dual_distribution)
+            if count
+        ) // dual_size
+        for w in range(n + 1)
+    ]
+
+
+def minimum_distance_from_distribution(distribution: List[int]) -> int:
+    """Минимальный ненулевой вес по весовому спектру (0, если ненулевых слов нет)."""
+    return next((weight for weight in range(1, len(distribution)) if distribution[weight]), 0)
+
+
+def dual_generator_matrix(generator_matrix: List[int], n: int) -> List[int]:
+    """Строит порождающую матрицу дуального кода (проверочную матрицу кода).
+
+    Матрица приводится к ступенчатому виду; каждый свободный столбец f даёт
+    строку дуального кода: бит f и ведущие биты строк, в которых стоит бит f.
+    """
+    rows, pivots = _row_reduce(generator_matrix, range(n - 1, -1, -1))
+    pivot_set = set(pivots)
+
+    dual_rows = []
+    for free in range(n - 1, -1, -1):
+        if free in pivot_set:
+            continue
+        dual_row = 1 << free
+        for row, pivot in zip(rows, pivots):
+            if row >> free & 1:
+                dual_row |= 1 << pivot
+        dual_rows.append(dual_row)
+    return dual_rows
+
+
+def minimum_distance_bounds(
+    generator_matrix: List[int],
+    n: int,
+    max_weight: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Оценивает минимальное расстояние в духе алгоритма Брауэра — Циммермана.
+
+    Строятся порождающие матрицы, систематические на непересекающихся
+    информационных множествах. Перебираются суммы всё большего числа w строк
+    каждой матрицы: минимальный найденный вес — верхняя граница, а любое ещё не
+    встреченное кодовое слово имеет на каждом множестве ранга r вес не меньше
+    w + 1 - (k - r), что даёт нижнюю. Перебор останавливается, когда границы
+    сходятся или w превышает max_weight.
+
+    Args:
+        generator_matrix: Порождающая матрица в виде списка строк-целых чисел.
+        n: Длина кодового слова.
+        max_weight: Наибольшее число складываемых строк (без ограничения, если None).
+
+    Returns:
+        Кортеж (нижняя граница, верхняя граница); при равенстве расстояние точное.
+    """
+    k = len(generator_matrix)
+    matrices = []
+    remaining = list(range(n - 1, -1, -1))
+    while remaining:
+        rows, pivots = _row_reduce(generator_matrix, remaining)
+        if not pivots:
+            break
+        matrices.append((rows, len(pivots)))
+        used = set(pivots)
+        remaining = [column for column in remaining if column not in used]
+
+    upper = min(row.bit_count() for rows, _ in matrices for row in rows)
+    lower = 1
+    for weight in range(1, k + 1):
+        if max_weight is not None and weight > max_weight:
+            break
+        for rows, _ in matrices:
+            for codeword in _combination_sums(rows, weight):
+                upper = min(upper, codeword.bit_count())
+        # Перебраны все суммы строк, то есть все кодовые слова
+        if weight == k:
+            return upper, upper
+        lower = max(lower, sum(max(0, weight + 1 - (k - rank)) for _, rank in matrices))
+        if lower >= upper:
+            return upper, upper
+    return lower, upper
+
+
+def _enumerate_weights(rows: List[int], n: int, base: int, span_bits: int) -> List[int]:
+    """Весовой спектр смежного класса base + <rows> перебором кодом Грея."""
+    words = (n + 63) // 64
+    span_rows, gray_rows = rows[:span_bits], rows[span_bits:]
+
+    span = numpy.zeros((1, words), dtype=numpy.uint64)
+    for row in span_rows:
+        span = numpy.concatenate((span, span ^ _to_words(row, words)))
+    gray_words = [_to_words(row, words) for row in gray_rows]
+
+    distribution = numpy.zeros(n + 1, dtype=numpy.int64)
+    current = _to_words(base, words)
+    for step in range(1 << len(gray_rows)):
+        if step:
+            # Код Грея: на шаге step меняется строка с номером младшего единичного бита step
+            current ^= gray_words[(step & -step).bit_length() - 1]
+        weights = popcount(span ^ current).sum(axis=1, dtype=numpy.intp)
+        distribution += numpy.bincount(weights, minlength=n + 1)
+    return distribution.tolist()
+
+
+def _to_words(value: int, words: int) -> numpy.ndarray:
+    """Разбивает слово на 64-битные части (младшая часть первой)."""
+    return numpy.array([(value >> (64 * index)) & (2 ** 64 - 1) for index in range(words)], dtype=numpy.uint64)
+
+
+def _combination_xor(rows: List[int], mask: int) -> int:
+    """Сумма строк, выбранных битами mask (старший бит — строка 0)."""
+    result = 0
+    for index, row in enumerate(rows):
+        if mask >> (len(rows) - 1 - index) & 1:
+            result ^= row
+    return result
+
+
+def _combination_sums(rows: List[int], weight: int, start: int = 0, prefix: int = 0) -> Iterator[int]:
+    """Перебирает суммы всех сочетаний weight строк, по одному XOR на сочетание."""
+    if weight == 0:
+        yield prefix
+        return
+    for index in range(start, len(rows) - weight + 1):
+        yield from _combination_sums(rows, weight - 1, index + 1, prefix ^ rows[index])
+
+
+def _row_reduce(generator_matrix: List[int], columns: Iterable[int]) -> Tuple[List[int], List[int]]:
+    """Приводит матрицу к ступенчатому виду по столбцам columns (в порядке обхода).
+
+    Returns:
+        Кортеж (строки, ведущие столбцы): первые len(ведущие столбцы) строк
+        содержат единицу в своём ведущем столбце и нули в ведущих столбцах остальных.
+    """
+    rows = list(generator_matrix)
+    pivots = []
+    for column in columns:
+        if len(pivots) == len(rows):
+            break
+        rank = len(pivots)
+        pivot_row = next((index for index in range(rank, len(rows)) if rows[index] >> column & 1), None)
+        if pivot_row is None:
+            continue
+        rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+        for index in range(len(rows)):
+            if index != rank and rows[index] >> column & 1:
+                rows[index] ^= rows[rank]
+        pivots.append(column)
+    return rows, pivots
@@ -0,0 +1,77 @@
+import random
+import sys
+import time
+
+import networkx as nx
+
+from main import max_flow_algorithm
+
+
+# Исходный алгоритм с пометками медленный: запускаем его только на сетях не больше этого числа рёбер
+LABELING_MAX_EDGES = 20000
+# Эдмондс — Карп на слоистых сетях делает по пути на каждую единицу пропускной способности разреза
+EDMONDS_KARP_MAX_EDGES = 20000
+
+
+def random_network(node_count, edge_count, seed):
+    """Случайная сеть G(n, m) с пропускными способностями 100..1000, как в main; исток 0, сток 1."""
+    rng = random.Random(seed)
+    G = nx.gnm_random_graph(node_count, edge_count, seed=seed, directed=True)
+    for u, v in G.edges:
+        G[u][v]["capacity"] = rng.randint(100, 1000)
+    return G, 0, 1
+
+
+def layered_network(layers, width, degree, seed):
+    """Слоистая сеть: каждая вершина слоя соединена с degree случайными вершинами следующего."""
+    rng = random.Random(seed)
+    G = nx.DiGraph()
+    for layer in range(layers - 1):
+        for i in range(width):
+            for j in rng.sample(range(width), degree):
+                G.add_edge((layer, i), (layer + 1, j), capacity=rng.randint(100, 1000))
+    for i in range(width):
+        G.add_edge("s", (0, i), capacity=rng.randint(100, 1000))
+        G.add_edge((layers - 1, i), "t", capacity=rng.randint(100, 1000))
+    return G, "s", "t"
+
+
+NETWORKS = {
+    "random-2k-20k": lambda: random_network(2000, 20000, 1),
+    "layered-10x200": lambda: layered_network(10, 200, 5, 2),
+    "random-100k-1M": lambda: random_network(100000, 1000000, 3),
+    "layered-50x2000": lambda: layered_network(50, 2000, 5, 4),
+}
+
+ALGORITHM_NAMES = ["labeling", "edmonds-karp", "dinic", "push-relabel"]
+
+
+def benchmark_network(name, algorithms=ALGORITHM_NAMES):
+    G, source, sink = NETWORKS[name]()
+    edge_count = G.number_of_edges()
+    print(f"\n{name}: {G.number_of_nodes()} вершин, {edge_count} рёбер")
+
+    values = set()
+    for algorithm in algorithms:
+        if algorithm == "labeling" and edge_count > LABELING_MAX_EDGES:
+            continue
+        if algorithm == "edmonds-karp" and edge_count > EDMONDS_KARP_MAX_EDGES:
+            continue
+        start = time.perf_counter()
+        max_flow, _, _ = max_flow_algorithm(G, source, sink, algorithm=algorithm)
+        seconds = time.perf_counter() - start
+        values.add(max_flow)
+        print(f"  {algorithm:<13} поток {max_flow:<10} {seconds:8.2f} с")
+
+    if len(values) > 1:
+        print(f"  Алгоритмы разошлись: {sorted(values)}")
+
+
+def main() -> None:
+    names = sys.argv[1:] or list(NETWORKS)
+    for name in names:
+        benchmark_network(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from max_flow import ALGORITHMS
+from residual_graph import ResidualGraph
+
+
+class IncrementalMaxFlow:
+    """
+    Максимальный поток, который пересчитывается после изменения пропускных способностей.
+
+    Поток хранится в ResidualGraph между вызовами update. Увеличение
+    пропускной способности поток не портит. При уменьшении ниже текущего
+    потока лишнее d снимается с ребра (u, v): у u остаётся избыток d, у v —
+    недостача d. Сначала d пытаемся провести из u в v в обход ребра; что не
+    прошло, возвращаем из u в исток и добираем в v от стока, уменьшая поток.
+    Затем поток увеличивается выбранным алгоритмом, начиная с уже имеющегося:
+    увеличивающих путей нужно только на изменение, но сам вызов алгоритма
+    каждый раз проходит всю сеть (преобразование массивов, поиск в ширину),
+    то есть update стоит не меньше O(V + E).
+    """
+
+    def __init__(self, G, source, sink, algorithm="dinic"):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Неизвестный алгоритм: {algorithm}")
+        self.G = G
+        self.algorithm = ALGORITHMS[algorithm]
+        self.graph = ResidualGraph.from_networkx(G)
+        self.source = self.graph.index[source]
+        self.sink = self.graph.index[sink]
+        self.edge_index = {edge: number for number, edge in enumerate(self.graph.edges)}
+        self.value = self.algorithm(self.graph, self.source, self.sink)
+
+    def update(self, changes):
+        """
+        Применяем новые пропускные способности и восстанавливаем максимальный поток.
+
+        changes — словарь {(u, v): новая пропускная способность} для рёбер
+        исходного графа. Атрибуты capacity в G тоже обновляются.
+        Возвращает новую величину максимального потока.
+        """
+        graph = self.graph
+        for (u, v), capacity in changes.items():
+            if (u, v) not in self.edge_index:
+                raise KeyError(f"Ребра ({u}, {v}) нет в сети")
+            arc = graph.edge_arcs[self.edge_index[u, v]]
+            capacity = graph.set_capacity(arc, capacity)
+            self.G[u][v]["capacity"] = capacity
+
+            surplus = (graph.flow[arc] - capacity).item()
+            if surplus <= 0:
+                continue
+            graph.flow[arc] = capacity
+            graph.flow[graph.reverse[arc]] = -capacity
+
+            tail, head = graph.index[u], graph.index[v]
+            surplus -= self._push(tail, head, surplus)
+            if surplus > 0:
+                # Избыток tail возвращается в исток, недостача head покрывается от стока
+                if tail != self.source:
+                    self._push(tail, self.source, surplus)
+                if head != self.sink:
+                    self._push(self.sink, head, surplus)
+
+        self.value = self.algorithm(graph, self.source, self.sink)
+        return self.value
+
+    def write_flows(self):
+        self.graph.write_flows(self.G)
+
+    def cut_sets(self):
+        return self.graph.cut_sets(self.source)
+
+    def _push(self, start, end, limit):
+        """Проводим из start в end не больше limit по увеличивающим путям; возвращаем, сколько провели."""
+        graph = self.graph
+        sent = 0
+        while sent < limit and start != end:
+            levels, parent_arc = graph.bfs(start, end)
+            if levels[end] < 0:
+                break
+            arcs = graph.path_arcs(parent_arc, start, end)
+            delta = min(graph.residual()[arcs].min().item(), limit - sent)
+            graph.augment(arcs, delta)
+            sent += delta
+        return sent
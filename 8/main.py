@@ -1,11 +1,22 @@
 import numpy
+import os
 import random
+import sys
 from random import randint
 import networkx as nx
-import matplotlib.pyplot as plt
 from collections import deque
 
-def max_flow_algorithm(G, source, sink):
+# Общие для лабораторных модули лежат в пакете common в корне репозитория
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.graph_export import export_graph
+from max_flow import array_max_flow
+from min_cut import cut_from_sets, min_cut
+
+def max_flow_algorithm(G, source, sink, algorithm="labeling"):
+    # Алгоритмы на массивах: "edmonds-karp", "dinic", "push-relabel" (см. max_flow.ALGORITHMS)
+    if algorithm != "labeling":
+        return array_max_flow(G, source, sink, algorithm)
+
     # Шаг 1: Инициализация потоков (Этап 1)
     for u, v in G.edges:
         G[u][v]["flow"] = 0
@@ -137,7 +148,34 @@ def augment_flow(graph, path, delta):
             graph[v][u]["flow"] -= delta  # Уменьшение на обратных рёбрах
 
 # Визуализация разреза (Этап 3)
-def draw_graph_with_cut(graph, A, B, source, sink):
+def draw_graph_with_cut(graph, A, B, source, sink, output=None, cut=None):
+    # cut — результат min_cut: величины и рёбра разреза берутся из него. Без него рёбра и
+    # пропускная способность разреза считаются по A и B, а не по потокам из истока
+    if cut is not None:
+        A = cut.A
+        cut_edges = set(cut.cut_edges)
+        title = f"Max Flow: {cut.flow_value}, Min Cut: {cut.capacity}"
+    else:
+        edges, capacity = cut_from_sets(graph, A, B)
+        cut_edges = set(edges)
+        title = f"Cut: {capacity}"
+
+    # Без окна: сохраняем в файл (.svg/.png/.dot/.graphml) с послойной укладкой от истока
+    if output is not None:
+        export_graph(
+            graph,
+            output,
+            node_colors={node: "lightblue" if node in A else "lightgreen" for node in graph.nodes},
+            edge_colors={edge: "red" for edge in cut_edges},
+            edge_labels={(u, v): f"({graph[u][v]['capacity']})" for u, v in graph.edges},
+            title=title,
+            layout="layered",
+            source=source,
+        )
+        return
+
+    import matplotlib.pyplot as plt
+
     pos = nx.spring_layout(graph)
     plt.figure(figsize=(10, 6))
 
@@ -146,7 +184,7 @@ def draw_graph_with_cut(graph, A, B, source, sink):
 
     # Красные рёбра разреза (A->B)
     edge_colors = [
-        "red" if (u in A and v in B) else "black"
+        "red" if (u, v) in cut_edges else "black"
         for u, v in graph.edges
     ]
 
@@ -161,10 +199,12 @@ def draw_graph_with_cut(graph, A, B, source, sink):
     }
     nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, font_color="blue")
 
-    plt.title(f"Max Flow: {sum(graph[source][n]["flow"] for n in graph.successors(source))}")
+    plt.title(title)
     plt.show()
 
 def main() -> None:
+    # Каталог для картинок: если задан, графики сохраняются в файлы вместо окна
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else None
     random.seed(42)
 
     edges_list = [
@@ -198,7 +238,7 @@ def main() -> None:
             ("I", "C", randint(100, 1000)), ("I", "G", randint(100, 1000)), ("I", "H", randint(100, 1000)),
         ],
     ]
-    for edges in edges_list:
+    for number, edges in enumerate(edges_list, start=1):
         numpy.random.seed(5)
         G = nx.DiGraph()
 
@@ -210,8 +250,12 @@ def main() -> None:
         print(f"Множество A: {A}")
         print(f"Множество B: {B}")
 
-        # Шаг 8: Визуализация минимального разреза
-        draw_graph_with_cut(G, A, B, "A", "C")
+        # Шаг 8: Визуализация минимального разреза. min_cut даёт ту же сторону A
+        # (достижимые из истока при любом максимальном потоке) и проверяет, что поток равен разрезу
+        cut = min_cut(G, "A", "C")
+        print(f"Разрез подтверждён: {cut.certified}, пропускная способность {cut.capacity}")
+        output = os.path.join(output_dir, f"cut_{number}.svg") if output_dir else None
+        draw_graph_with_cut(G, A, B, "A", "C", output, cut=cut)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,236 @@
+from collections import deque
+
+import numpy
+
+from residual_graph import ResidualGraph, edmonds_karp
+
+
+def dinic(graph, source, sink):
+    """
+    Алгоритм Диница: слоистая сеть + блокирующий поток.
+
+    Уровни вершин считаются поиском в ширину по массивам (graph.bfs),
+    блокирующий поток — итеративным поиском в глубину по текущим дугам
+    (current[u] — первая ещё не отвергнутая дуга вершины u), поэтому каждая
+    дуга за фазу просматривается не больше одного раза, а рекурсии нет.
+    Возвращает величину потока.
+    """
+    if source == sink:
+        return 0
+
+    heads = graph.heads.tolist()
+    tails = graph.tails.tolist()
+    reverse = graph.reverse.tolist()
+    offsets = graph.offsets.tolist()
+
+    while True:
+        levels, _ = graph.bfs(source, sink)
+        if levels[sink] < 0:
+            return graph.flow_value(source)
+
+        level = levels.tolist()
+        residual = graph.residual().tolist()
+        current = offsets[:-1]
+        path = []
+        u = source
+
+        while True:
+            if u == sink:
+                delta = min(residual[arc] for arc in path)
+                first_saturated = None
+                for index, arc in enumerate(path):
+                    residual[arc] -= delta
+                    residual[reverse[arc]] += delta
+                    if first_saturated is None and residual[arc] == 0:
+                        first_saturated = index
+                # Продолжаем с начала первой насыщенной дуги
+                del path[first_saturated:]
+                u = heads[path[-1]] if path else source
+                continue
+
+            end = offsets[u + 1]
+            arc = current[u]
+            next_level = level[u] + 1
+            while arc < end and (residual[arc] <= 0 or level[heads[arc]] != next_level):
+                arc += 1
+            current[u] = arc
+
+            if arc < end:
+                path.append(arc)
+                u = heads[arc]
+            elif u == source:
+                break
+            else:
+                # Тупик: вершина больше не нужна в этой фазе, отступаем
+                level[u] = -1
+                arc = path.pop()
+                u = tails[arc]
+                current[u] += 1
+
+        graph.flow = graph.capacity - numpy.array(residual, dtype=graph.capacity.dtype)
+
+
+def push_relabel(graph, source, sink):
+    """
+    Проталкивание предпотока с выбором активной вершины наибольшей высоты.
+
+    Эвристики: глобальная перемаркировка (высоты пересчитываются обратным
+    поиском в ширину от стока после каждых ~V перемаркировок) и разрыв
+    (если на высоте h не осталось вершин, все вершины выше h отрезаны от стока).
+    Первая фаза строит максимальный предпоток, вторая — тем же методом
+    возвращает застрявший избыток в исток, чтобы получился поток.
+    Возвращает величину потока.
+    """
+    if source == sink:
+        return 0
+
+    heads = graph.heads.tolist()
+    reverse = graph.reverse.tolist()
+    offsets = graph.offsets.tolist()
+    residual = graph.residual().tolist()
+    excess = [0] * graph.node_count
+
+    # Насыщаем все дуги из истока
+    for arc in range(offsets[source], offsets[source + 1]):
+        delta = residual[arc]
+        if delta > 0:
+            residual[arc] = 0
+            residual[reverse[arc]] += delta
+            excess[heads[arc]] += delta
+            excess[source] -= delta
+
+    _discharge_all(heads, reverse, offsets, residual, excess, sink, (source, sink))
+    _discharge_all(heads, reverse, offsets, residual, excess, source, (source, sink))
+
+    graph.flow = graph.capacity - numpy.array(residual, dtype=graph.capacity.dtype)
+    return graph.flow_value(source)
+
+
+def _discharge_all(heads, reverse, offsets, residual, excess, target, passive):
+    """
+    Проталкиваем избыток вершин к target, пока это возможно.
+
+    Вершины из passive не разгружаются, а вершина, достигшая высоты n,
+    считается отрезанной от target и больше не обрабатывается.
+    """
+    n = len(excess)
+    height = []
+    buckets = []
+    # Вершины каждой высоты меньше n: разрыв поднимает только их, не просматривая весь граф
+    members = []
+    current = []
+    top = 0  # Наибольшая высота меньше n, на которой могут быть вершины
+
+    def global_relabel():
+        nonlocal top
+        # Высота — расстояние до target по дугам с положительной остаточной способностью
+        height[:] = [n] * n
+        height[target] = 0
+        queue = deque([target])
+        while queue:
+            v = queue.popleft()
+            next_height = height[v] + 1
+            for arc in range(offsets[v], offsets[v + 1]):
+                u = heads[arc]
+                if height[u] == n and residual[reverse[arc]] > 0 and u not in passive:
+                    height[u] = next_height
+                    queue.append(u)
+        buckets[:] = [[] for _ in range(n)]
+        members[:] = [set() for _ in range(n)]
+        for u in range(n):
+            if height[u] < n:
+                members[height[u]].add(u)
+                if excess[u] > 0 and u not in passive:
+                    buckets[height[u]].append(u)
+        top = max((h for h in height if h < n), default=0)
+        current[:] = offsets[:-1]
+
+    global_relabel()
+    highest = n - 1
+    relabels = 0
+
+    while highest >= 0:
+        if not buckets[highest]:
+            highest -= 1
+            continue
+        u = buckets[highest].pop()
+        if height[u] != highest or excess[u] <= 0:
+            continue
+
+        # Разгрузка вершины u
+        while excess[u] > 0:
+            arc = current[u]
+            end = offsets[u + 1]
+            if arc == end:
+                # Перемаркировка
+                relabels += 1
+                old_height = height[u]
+                new_height = n
+                for candidate in range(offsets[u], end):
+                    if residual[candidate] > 0 and height[heads[candidate]] + 1 < new_height:
+                        new_height = height[heads[candidate]] + 1
+                members[old_height].discard(u)
+                height[u] = new_height
+                if new_height < n:
+                    members[new_height].add(u)
+                    top = max(top, new_height)
+                current[u] = offsets[u]
+                if not members[old_height]:
+                    # Разрыв: вершины выше old_height не достигают target
+                    for gap_height in range(old_height + 1, top + 1):
+                        for v in members[gap_height]:
+                            height[v] = n
+                        members[gap_height].clear()
+                    top = old_height - 1
+                if height[u] >= n:
+                    break
+                continue
+
+            v = heads[arc]
+            if residual[arc] > 0 and height[u] == height[v] + 1:
+                delta = min(excess[u], residual[arc])
+                residual[arc] -= delta
+                residual[reverse[arc]] += delta
+                excess[u] -= delta
+                if excess[v] == 0 and v != target and v not in passive:
+                    buckets[height[v]].append(v)
+                    # v на единицу ниже u, а u после перемаркировок мог оказаться выше highest
+                    highest = max(highest, height[v])
+                excess[v] += delta
+            else:
+                current[u] = arc + 1
+
+        if height[u] < n and excess[u] > 0:
+            buckets[height[u]].append(u)
+        if height[u] < n:
+            highest = max(highest, height[u])
+
+        if relabels >= n:
+            relabels = 0
+            global_relabel()
+            highest = n - 1
+
+
+# Алгоритмы на массивах ResidualGraph: название -> функция (graph, s, t) -> величина потока
+ALGORITHMS = {
+    "edmonds-karp": edmonds_karp,
+    "dinic": dinic,
+    "push-relabel": push_relabel,
+}
+
+
+def array_max_flow(G, source, sink, algorithm="dinic"):
+    """
+    Максимальный поток одним из алгоритмов ALGORITHMS на массивах.
+
+    Потоки записываются в G[u][v]["flow"]; возвращается (max_flow, A, B),
+    как у max_flow_algorithm.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}")
+    graph = ResidualGraph.from_networkx(G)
+    s, t = graph.index[source], graph.index[sink]
+    max_flow = ALGORITHMS[algorithm](graph, s, t)
+    graph.write_flows(G)
+    A, B = graph.cut_sets(s)
+    return max_flow, A, B
@@ -0,0 +1,176 @@
+from typing import NamedTuple
+
+import networkx as nx
+import numpy
+
+from max_flow import ALGORITHMS
+from residual_graph import ResidualGraph
+
+
+# Относительный допуск сертификата для дробных пропускных способностей (от их суммы)
+CERTIFICATE_RTOL = 1e-9
+
+
+class MinCut(NamedTuple):
+    """Минимальный разрез с сертификатом: поток равен пропускной способности разреза."""
+
+    flow_value: object
+    capacity: object
+    A: set
+    B: set
+    cut_edges: list
+    # Поток допустим (ограничения и сохранение) и равен capacity — значит, оба оптимальны
+    certified: bool
+
+
+def min_cut(G, source, sink, algorithm="dinic"):
+    """
+    Максимальный поток и минимальный разрез nx.DiGraph одним вызовом.
+
+    A — вершины, достижимые из истока в остаточной сети; рёбра разреза — все
+    рёбра из A в B. Потоки записываются в G[u][v]["flow"].
+    """
+    graph = ResidualGraph.from_networkx(G)
+    s, t = graph.index[source], graph.index[sink]
+    flow_value = ALGORITHMS[algorithm](graph, s, t)
+    graph.write_flows(G)
+    return _certified_cut(graph, s, t, flow_value)
+
+
+def cut_from_sets(G, A, B):
+    """Рёбра из A в B и их суммарная пропускная способность (например, для результата max_flow_algorithm)."""
+    cut_edges = [(u, v) for u, v in G.edges if u in A and v in B]
+    return cut_edges, sum(G[u][v]["capacity"] for u, v in cut_edges)
+
+
+def _certified_cut(graph, s, t, flow_value):
+    source_side = graph.reachable(s)
+    forward = graph.edge_arcs
+    tails, heads = graph.tails[forward], graph.heads[forward]
+    crossing = source_side[tails] & ~source_side[heads]
+    capacity = graph.capacity[forward][crossing].sum().item()
+
+    # Кососимметричный поток: сумма по всем дугам вершины — её чистый отток
+    net_outflow = numpy.bincount(graph.tails, weights=graph.flow, minlength=graph.node_count)
+    net_outflow[[s, t]] = 0
+    flow = graph.flow[forward]
+    # Дробные потоки считаются как capacity - residual с округлением: сравниваем
+    # с допуском, пропорциональным суммарной пропускной способности
+    tolerance = 0
+    if graph.capacity.dtype.kind == "f":
+        tolerance = CERTIFICATE_RTOL * max(float(numpy.abs(graph.capacity[forward]).sum()), 1.0)
+    feasible = bool(
+        (flow >= -tolerance).all()
+        and (flow <= graph.capacity[forward] + tolerance).all()
+        and (numpy.abs(net_outflow) <= tolerance).all()
+    )
+
+    edges = graph.edges
+    cut_edges = [edges[index] for index in numpy.flatnonzero(crossing).tolist()]
+    A = {node for node, reached in zip(graph.nodes, source_side.tolist()) if reached}
+    B = set(graph.nodes) - A
+    return MinCut(flow_value, capacity, A, B, cut_edges, feasible and abs(flow_value - capacity) <= tolerance)
+
+
+class GomoryHuTree:
+    """
+    Дерево Гомори — Ху неориентированной сети (алгоритм Гасфилда).
+
+    Строится за V - 1 вычислений максимального потока на одной остаточной
+    сети (каждое ребро — две встречные дуги). Минимальный разрез между
+    любыми u и v равен наименьшему весу ребра на пути между ними в дереве,
+    а удаление этого ребра делит вершины на стороны разреза, так что запрос
+    отвечается за O(V) без вычисления потока.
+    """
+
+    def __init__(self, G, capacity="capacity", algorithm="dinic"):
+        edges = list(G.edges(data=capacity))
+        nodes = list(G.nodes)
+        index = {node: number for number, node in enumerate(nodes)}
+        tails = [index[u] for u, _, _ in edges]
+        heads = [index[v] for _, v, _ in edges]
+        capacities = [value for _, _, value in edges]
+        graph = ResidualGraph(len(nodes), tails + heads, heads + tails, capacities + capacities)
+        solve = ALGORITHMS[algorithm]
+
+        n = len(nodes)
+        parent = [0] * n
+        weight = [0] * n
+        for s in range(1, n):
+            t = parent[s]
+            graph.flow[:] = 0
+            value = solve(graph, s, t)
+            side = graph.reachable(s).tolist()
+            weight[s] = value
+            for i in range(n):
+                if i != s and side[i] and parent[i] == t:
+                    parent[i] = s
+            if side[parent[t]]:
+                parent[s] = parent[t]
+                parent[t] = s
+                weight[s] = weight[t]
+                weight[t] = value
+
+        self.nodes = nodes
+        self.index = index
+        self.parent = parent
+        self.weight = weight
+        self.children = [[] for _ in range(n)]
+        for node in range(1, n):
+            self.children[parent[node]].append(node)
+        self.depth = [0] * n
+        for node in range(n):
+            self._depth(node)
+
+    def _depth(self, node):
+        chain = []
+        while node != 0 and self.depth[node] == 0:
+            chain.append(node)
+            node = self.parent[node]
+        depth = self.depth[node]
+        for node in reversed(chain):
+            depth += 1
+            self.depth[node] = depth
+        return depth
+
+    def _min_edge(self, u, v):
+        """Вершина, под которой висит ребро наименьшего веса на пути u—v в дереве."""
+        best = None
+        while u != v:
+            if self.depth[u] < self.depth[v]:
+                u, v = v, u
+            if best is None or self.weight[u] < self.weight[best]:
+                best = u
+            u = self.parent[u]
+        return best
+
+    def min_cut_value(self, u, v):
+        """Величина минимального разреза между u и v."""
+        best = self._min_edge(self.index[u], self.index[v])
+        return self.weight[best] if best is not None else 0
+
+    def min_cut(self, u, v):
+        """(величина, сторона u, сторона v) минимального разреза между u и v."""
+        best = self._min_edge(self.index[u], self.index[v])
+        if best is None:
+            return 0, set(self.nodes), set()
+        # Поддерево best — одна сторона разреза
+        below = {best}
+        stack = [best]
+        while stack:
+            for child in self.children[stack.pop()]:
+                below.add(child)
+                stack.append(child)
+        below_names = {self.nodes[node] for node in below}
+        above_names = set(self.nodes) - below_names
+        if u in below_names:
+            return self.weight[best], below_names, above_names
+        return self.weight[best], above_names, below_names
+
+    def to_networkx(self):
+        """Дерево как nx.Graph с весами рёбер в атрибуте weight."""
+        tree = nx.Graph()
+        tree.add_nodes_from(self.nodes)
+        for node in range(1, len(self.nodes)):
+            tree.add_edge(self.nodes[node], self.nodes[self.parent[node]], weight=self.weight[node])
+        return tree
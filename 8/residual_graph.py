@@ -0,0 +1,197 @@
+import numpy
+
+
+class ResidualGraph:
+    """
+    Остаточная сеть в массивах NumPy.
+
+    Вершины пронумерованы 0..V-1. Каждое ребро (u, v) даёт пару дуг:
+    прямую u -> v с пропускной способностью capacity и обратную v -> u
+    с нулевой; reverse[arc] — номер парной дуги. Поток кососимметричен:
+    flow[reverse[arc]] == -flow[arc], остаточная способность дуги —
+    capacity - flow. Дуги упорядочены по началу (CSR): дуги вершины u —
+    это offsets[u]..offsets[u + 1].
+    """
+
+    def __init__(self, node_count, tails, heads, capacities):
+        edge_count = len(tails)
+        tails = numpy.asarray(tails, dtype=numpy.intp)
+        heads = numpy.asarray(heads, dtype=numpy.intp)
+        capacities = numpy.asarray(capacities)
+        if capacities.dtype.kind not in "iuf":
+            capacities = capacities.astype(numpy.float64)
+        if capacities.dtype.kind != "f":
+            capacities = capacities.astype(numpy.int64)
+
+        # Дуги 0..E-1 — прямые, E..2E-1 — обратные; затем сортируем по началу
+        arc_tails = numpy.concatenate((tails, heads))
+        arc_heads = numpy.concatenate((heads, tails))
+        arc_capacities = numpy.concatenate((capacities, numpy.zeros_like(capacities)))
+        order = numpy.argsort(arc_tails, kind="stable")
+        position = numpy.empty_like(order)
+        position[order] = numpy.arange(len(order))
+
+        self.node_count = node_count
+        self.tails = arc_tails[order]
+        self.heads = arc_heads[order]
+        self.capacity = arc_capacities[order]
+        self.flow = numpy.zeros_like(self.capacity)
+        self.offsets = numpy.searchsorted(self.tails, numpy.arange(node_count + 1))
+        # Номер прямой дуги для каждого исходного ребра и парные дуги
+        self.edge_arcs = position[:edge_count]
+        self.reverse = numpy.empty_like(order)
+        self.reverse[position[:edge_count]] = position[edge_count:]
+        self.reverse[position[edge_count:]] = position[:edge_count]
+        # Имена вершин исходного графа (если он был) и их номера
+        self.nodes = list(range(node_count))
+        self.index = {node: node for node in self.nodes}
+
+    @classmethod
+    def from_networkx(cls, G, capacity="capacity"):
+        """Строим остаточную сеть по nx.DiGraph; имена вершин сохраняются в nodes/index."""
+        nodes = list(G.nodes)
+        index = {node: number for number, node in enumerate(nodes)}
+        edges = list(G.edges(data=capacity))
+        graph = cls(
+            len(nodes),
+            [index[u] for u, _, _ in edges],
+            [index[v] for _, v, _ in edges],
+            [value for _, _, value in edges],
+        )
+        graph.nodes = nodes
+        graph.index = index
+        graph.edges = [(u, v) for u, v, _ in edges]
+        return graph
+
+    def residual(self):
+        return self.capacity - self.flow
+
+    def set_capacity(self, arc, capacity):
+        """
+        Задаём пропускную способность дуги.
+
+        Если сеть целочисленная, а capacity дробная, capacity и flow переводятся
+        в float64: иначе присваивание в массив int64 молча отбросило бы дробную часть.
+        Целое значение типа float в целочисленной сети приводится к int.
+        Возвращает записанное значение.
+        """
+        if capacity < 0:
+            raise ValueError(f"Пропускная способность должна быть неотрицательной: {capacity}")
+        if self.capacity.dtype.kind != "f":
+            if not float(capacity).is_integer():
+                self.capacity = self.capacity.astype(numpy.float64)
+                self.flow = self.flow.astype(numpy.float64)
+            else:
+                # 5.0 в целочисленной сети — это 5: дальше поток считается в целых
+                capacity = int(capacity)
+        self.capacity[arc] = capacity
+        return capacity
+
+    def edge_flows(self):
+        """Поток по исходным рёбрам (в порядке построения)."""
+        return self.flow[self.edge_arcs]
+
+    def write_flows(self, G, flow="flow"):
+        """Записываем потоки обратно в атрибуты рёбер nx.DiGraph, из которого построена сеть."""
+        for (u, v), value in zip(self.edges, self.edge_flows().tolist()):
+            G[u][v][flow] = value
+
+    def flow_value(self, source):
+        """Величина потока: сумма потоков по дугам, выходящим из истока."""
+        arcs = slice(self.offsets[source], self.offsets[source + 1])
+        return self.flow[arcs].sum().item()
+
+    def outgoing_arcs(self, nodes):
+        """Номера всех дуг, выходящих из вершин nodes (одним массивом)."""
+        starts = self.offsets[nodes]
+        counts = self.offsets[nodes + 1] - starts
+        total = counts.sum()
+        # Номер дуги = начало списка её вершины + смещение внутри списка
+        shifts = numpy.repeat(starts - (numpy.cumsum(counts) - counts), counts)
+        return shifts + numpy.arange(total)
+
+    def bfs(self, source, sink=None):
+        """
+        Поиск в ширину по дугам с положительной остаточной способностью.
+
+        Обрабатывается сразу весь фронт: дуги фронта, их концы и фильтры по
+        непосещённым вершинам считаются операциями над массивами.
+        Возвращает (levels, parent_arc): расстояние от истока (-1 — недостижима)
+        и дугу, по которой вершина достигнута. Если задан сток, поиск
+        останавливается на уровне, где он найден.
+        """
+        levels = numpy.full(self.node_count, -1, dtype=numpy.intp)
+        parent_arc = numpy.full(self.node_count, -1, dtype=numpy.intp)
+        levels[source] = 0
+        frontier = numpy.array([source], dtype=numpy.intp)
+        residual = self.residual()
+        level = 0
+
+        while len(frontier):
+            arcs = self.outgoing_arcs(frontier)
+            arcs = arcs[residual[arcs] > 0]
+            arcs = arcs[levels[self.heads[arcs]] < 0]
+            heads, first = numpy.unique(self.heads[arcs], return_index=True)
+            level += 1
+            levels[heads] = level
+            parent_arc[heads] = arcs[first]
+            if sink is not None and levels[sink] >= 0:
+                break
+            frontier = heads
+
+        return levels, parent_arc
+
+    def path_arcs(self, parent_arc, source, sink):
+        """Дуги пути от истока к стоку по результату bfs."""
+        arcs = []
+        node = sink
+        while node != source:
+            arc = parent_arc[node].item()
+            arcs.append(arc)
+            node = self.tails[arc].item()
+        arcs.reverse()
+        return numpy.array(arcs, dtype=numpy.intp)
+
+    def augment(self, arcs, delta):
+        """Увеличиваем поток вдоль дуг на delta (обратные дуги — на -delta)."""
+        self.flow[arcs] += delta
+        self.flow[self.reverse[arcs]] -= delta
+
+    def reachable(self, source):
+        """Маска вершин, достижимых из истока в остаточной сети (сторона A минимального разреза)."""
+        levels, _ = self.bfs(source)
+        return levels >= 0
+
+    def cut_sets(self, source):
+        """Разрез (A, B) по именам вершин: A — достижимые из истока в остаточной сети."""
+        source_side = self.reachable(source).tolist()
+        A = {node for node, reached in zip(self.nodes, source_side) if reached}
+        B = {node for node, reached in zip(self.nodes, source_side) if not reached}
+        return A, B
+
+
+def edmonds_karp(graph, source, sink):
+    """Кратчайшие увеличивающие пути (Эдмондс — Карп) на массивах; возвращает величину потока."""
+    if source == sink:
+        return 0
+    while True:
+        levels, parent_arc = graph.bfs(source, sink)
+        if levels[sink] < 0:
+            return graph.flow_value(source)
+        arcs = graph.path_arcs(parent_arc, source, sink)
+        graph.augment(arcs, graph.residual()[arcs].min())
+
+
+def edmonds_karp_max_flow(G, source, sink):
+    """
+    Та же задача, что и max_flow_algorithm, но на массивах ResidualGraph.
+
+    Потоки записываются в G[u][v]["flow"]; возвращается (max_flow, A, B),
+    где A — вершины, достижимые из истока в остаточной сети.
+    """
+    graph = ResidualGraph.from_networkx(G)
+    s, t = graph.index[source], graph.index[sink]
+    max_flow = edmonds_karp(graph, s, t)
+    graph.write_flows(G)
+    A, B = graph.cut_sets(s)
+    return max_flow, A, B
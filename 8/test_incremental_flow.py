@@ -0,0 +1,56 @@
+import random
+
+import networkx as nx
+import pytest
+
+from incremental_flow import IncrementalMaxFlow
+from max_flow import ALGORITHMS
+
+
+def _chain():
+    G = nx.DiGraph()
+    G.add_edge("s", "a", capacity=10)
+    G.add_edge("a", "t", capacity=10)
+    return G
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_integral_float_keeps_integer_network(algorithm):
+    flow = IncrementalMaxFlow(_chain(), "s", "t", algorithm)
+
+    assert flow.update({("s", "a"): 5.0}) == 5
+    assert flow.graph.capacity.dtype.kind == "i"
+    assert flow.update({("s", "a"): 7}) == 7
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_fractional_capacity_is_not_truncated(algorithm):
+    G = _chain()
+    flow = IncrementalMaxFlow(G, "s", "t", algorithm)
+
+    assert flow.update({("s", "a"): 2.5}) == pytest.approx(2.5)
+    assert G["s"]["a"]["capacity"] == 2.5
+
+
+def test_negative_capacity_is_rejected():
+    G = _chain()
+    flow = IncrementalMaxFlow(G, "s", "t")
+
+    with pytest.raises(ValueError):
+        flow.update({("s", "a"): -1})
+    assert G["s"]["a"]["capacity"] == 10
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_updates_match_networkx(algorithm):
+    rng = random.Random(5)
+    for seed in range(30):
+        G = nx.gnm_random_graph(12, 40, seed=seed, directed=True)
+        for u, v in G.edges:
+            G[u][v]["capacity"] = rng.randint(0, 9)
+        flow = IncrementalMaxFlow(G, 0, 11, algorithm)
+        for step in range(4):
+            edges = rng.sample(list(G.edges), 5)
+            # Сначала целые (в том числе вида 3.0), потом дробные изменения
+            changes = {edge: rng.randint(0, 9) + (rng.choice([0.0, 0.5, 0.25]) if step >= 2 else 0.0) for edge in edges}
+            assert flow.update(changes) == pytest.approx(nx.maximum_flow_value(G, 0, 11))
@@ -0,0 +1,47 @@
+import random
+
+import networkx as nx
+import pytest
+
+from max_flow import ALGORITHMS
+from min_cut import min_cut
+
+
+def _network(edges):
+    G = nx.DiGraph()
+    for u, v, capacity in edges:
+        G.add_edge(u, v, capacity=capacity)
+    return G
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_float_capacities_are_certified(algorithm):
+    # 0.1 + 0.2 != 0.3 в двоичной арифметике: точное сравнение не проходило
+    G = _network([(0, 1, 0.1), (0, 2, 0.2), (1, 3, 1), (2, 3, 1)])
+    cut = min_cut(G, 0, 3, algorithm)
+
+    assert cut.certified
+    assert cut.flow_value == pytest.approx(0.3)
+    assert cut.capacity == pytest.approx(0.3)
+    assert set(cut.cut_edges) == {(0, 1), (0, 2)}
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_random_float_networks_are_certified(algorithm):
+    rng = random.Random(1)
+    for seed in range(100):
+        G = nx.gnm_random_graph(15, 50, seed=seed, directed=True)
+        for u, v in G.edges:
+            G[u][v]["capacity"] = rng.uniform(0, 10)
+        cut = min_cut(G, 0, 14, algorithm)
+
+        assert cut.certified, seed
+        assert cut.capacity == pytest.approx(nx.maximum_flow_value(G, 0, 14))
+
+
+def test_integer_network_is_certified_exactly():
+    G = _network([("s", "a", 3), ("s", "b", 2), ("a", "t", 2), ("b", "t", 5), ("a", "b", 1)])
+    cut = min_cut(G, "s", "t")
+
+    assert cut.certified
+    assert cut.flow_value == cut.capacity == 5
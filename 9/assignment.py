@@ -0,0 +1,256 @@
+import heapq
+import time
+
+import networkx as nx
+import numpy
+
+from matching import BipartiteCSR
+
+
+def hungarian(cost):
+    """
+    Венгерский алгоритм для прямоугольной матрицы стоимостей n x m, n <= m, O(n^2 m).
+
+    Строки добавляются по одной; для каждой ищется кратчайший увеличивающий
+    путь с потенциалами u (строки) и v (столбцы). Внутренний цикл по столбцам
+    выполняется операциями NumPy над целой строкой.
+    Возвращает массив: столбец, назначенный каждой строке.
+    """
+    cost = numpy.asarray(cost, dtype=float)
+    n, m = cost.shape
+    if n > m:
+        raise ValueError("Строк должно быть не больше, чем столбцов")
+
+    # Индексация с 1, как в классической записи: столбец 0 — фиктивный
+    u = numpy.zeros(n + 1)
+    v = numpy.zeros(m + 1)
+    row_of = numpy.zeros(m + 1, dtype=numpy.intp)
+    way = numpy.zeros(m + 1, dtype=numpy.intp)
+
+    for row in range(1, n + 1):
+        row_of[0] = row
+        column = 0
+        minv = numpy.full(m + 1, numpy.inf)
+        used = numpy.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = row_of[column]
+            reduced = cost[current_row - 1] - u[current_row] - v[1:]
+            free = ~used[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = column
+
+            candidates = numpy.where(free, minv[1:], numpy.inf)
+            next_column = int(candidates.argmin()) + 1
+            delta = candidates[next_column - 1]
+
+            u[row_of[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+
+            column = next_column
+            if row_of[column] == 0:
+                break
+
+        # Переворачиваем найденный путь
+        while column:
+            previous = way[column]
+            row_of[column] = row_of[previous]
+            column = previous
+
+    assigned = numpy.full(n, -1, dtype=numpy.intp)
+    columns = numpy.flatnonzero(row_of[1:])
+    assigned[row_of[1:][columns] - 1] = columns
+    return assigned
+
+
+def hungarian_assignment(cost):
+    """
+    Назначение минимальной стоимости для плотной матрицы cost (работы x исполнители).
+
+    Если строк больше, чем столбцов, задача решается для транспонированной матрицы.
+    Возвращает (matching_edges, size, total_cost); рёбра — (строка, столбец).
+    """
+    cost = numpy.asarray(cost, dtype=float)
+    if cost.shape[0] > cost.shape[1]:
+        columns = hungarian(cost.T)
+        matching_edges = [(row, column) for column, row in enumerate(columns.tolist())]
+    else:
+        rows = hungarian(cost)
+        matching_edges = list(enumerate(rows.tolist()))
+
+    total_cost = sum(cost[row, column] for row, column in matching_edges)
+    return matching_edges, len(matching_edges), total_cost
+
+
+def successive_shortest_paths(graph):
+    """
+    Паросочетание наибольшего размера и наименьшей стоимости на разреженном BipartiteCSR с весами.
+
+    Левые вершины добавляются по одной, как в венгерском алгоритме (разреженный
+    вариант Джонкера — Волгенанта): поиск Дейкстры по приведённым стоимостям
+    c(u, v) + p[u] - p[v] >= 0 идёт из новой вершины только до ближайшей
+    свободной правой, так что просматривается лишь её окрестность, а не весь лес.
+    У каждой левой вершины есть фиктивная пара со штрафом penalty, больше любой
+    разницы в стоимости настоящих паросочетаний: выбрав её, вершина остаётся
+    свободной. Поэтому каждая вершина «сочетается», и паросочетание остаётся
+    наибольшим, а среди наибольших — самым дешёвым; при этом вершина может и
+    вытеснить уже сочетавшуюся, если так дешевле.
+    O(V * E log V) в худшем случае, отрицательные стоимости допустимы.
+    Возвращает (match_left, match_edge): правая вершина и номер ребра в neighbors для каждой левой.
+    """
+    left_count = graph.left_count
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    weights = graph.weights
+
+    match_left = [-1] * left_count
+    match_edge = [-1] * left_count
+    match_right = [-1] * graph.right_count
+    if not weights:
+        return match_left, match_edge
+
+    edge_left = [u for u in range(left_count) for _ in range(offsets[u], offsets[u + 1])]
+    low, high = min(weights), max(weights)
+    # Лишняя настоящая пара меняет стоимость не больше чем на (L - 1) * (high - low) + high
+    penalty = left_count * (high - low) + abs(high) + abs(low) + 1
+
+    # У всех свободных правых вершин (и фиктивных) потенциал одинаковый и равен low,
+    # поэтому ближайшая по приведённой стоимости свободная вершина — и самая дешёвая по настоящей
+    left_potential = [0] * left_count
+    right_potential = [low] * graph.right_count
+
+    infinity = float("inf")
+    left_dist = [infinity] * left_count
+    right_dist = [infinity] * graph.right_count
+    right_parent = [-1] * graph.right_count
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    for root in range(left_count):
+        if offsets[root] == offsets[root + 1]:
+            continue
+
+        left_dist[root] = 0
+        heap = [(0, root)]
+        settled_left = []
+        settled_right = []
+        # Лучшая фиктивная пара среди пройденных левых вершин: (расстояние, вершина)
+        dummy_dist, dummy_left = infinity, -1
+        end = -1
+        while heap and heap[0][0] < dummy_dist:
+            d, x = heappop(heap)
+            if x < left_count:
+                # Левая вершина достигается только по ребру паросочетания, то есть один раз
+                settled_left.append(x)
+                base = d + left_potential[x]
+                if base + penalty - low < dummy_dist:
+                    dummy_dist, dummy_left = base + penalty - low, x
+                skip = match_edge[x]
+                for index in range(offsets[x], offsets[x + 1]):
+                    if index == skip:
+                        continue
+                    v = neighbors[index]
+                    candidate = base + weights[index] - right_potential[v]
+                    if candidate < right_dist[v]:
+                        right_dist[v] = candidate
+                        right_parent[v] = index
+                        heappush(heap, (candidate, left_count + v))
+            else:
+                v = x - left_count
+                if d > right_dist[v]:
+                    continue
+                settled_right.append(v)
+                w = match_right[v]
+                if w == -1:
+                    end = v
+                    break
+                # Обратное ребро паросочетания имеет нулевую приведённую стоимость
+                left_dist[w] = d
+                heappush(heap, (d, w))
+
+        if end == -1:
+            # Дешевле оставить свободной вершину dummy_left: её пара освобождается
+            D = dummy_dist
+            if dummy_left != root:
+                end = match_left[dummy_left]
+                match_left[dummy_left] = -1
+                match_edge[dummy_left] = -1
+        else:
+            D = right_dist[end]
+
+        # Потенциалы: p += dist - D для вершин, пройденных до цели, остальные не меняются
+        for u in settled_left:
+            left_potential[u] += left_dist[u] - D
+            left_dist[u] = infinity
+        for v in settled_right:
+            right_potential[v] += right_dist[v] - D
+        # Расстояния сбрасываем у всех достигнутых правых, в том числе не пройденных
+        for _, x in heap:
+            if x >= left_count:
+                right_dist[x - left_count] = infinity
+            else:
+                left_dist[x] = infinity
+        for v in settled_right:
+            right_dist[v] = infinity
+
+        # Переворачиваем путь от end к root по рёбрам, которыми достигались правые вершины
+        v = end
+        while v != -1:
+            index = right_parent[v]
+            u = edge_left[index]
+            previous = match_left[u]
+            match_left[u] = v
+            match_edge[u] = index
+            match_right[v] = u
+            v = previous if u != root else -1
+
+    return match_left, match_edge
+
+
+def shortest_path_assignment(G, left=None, weight="weight"):
+    """
+    Назначение минимальной стоимости на разреженном двудольном графе G.
+
+    Стоимость ребра — атрибут weight. Находится паросочетание наибольшего
+    размера, а среди таких — самое дешёвое. Для полных графов быстрее
+    hungarian_assignment на матрице стоимостей.
+    Возвращает (matching_edges, size, total_cost); рёбра — (u, v), u из левой доли.
+    """
+    graph = BipartiteCSR.from_networkx(G, left, weight)
+    match_left, match_edge = successive_shortest_paths(graph)
+
+    matching_edges = []
+    total_cost = 0
+    for u, v in enumerate(match_left):
+        if v != -1:
+            matching_edges.append((graph.left_nodes[u], graph.right_nodes[v]))
+            total_cost += graph.weights[match_edge[u]]
+    return matching_edges, len(matching_edges), total_cost
+
+
+def main() -> None:
+    rng = numpy.random.default_rng(47)
+
+    size = 500
+    cost = rng.integers(1, 1000, size=(size, size))
+    start = time.perf_counter()
+    _, matched, total_cost = hungarian_assignment(cost)
+    print(f"Венгерский алгоритм {size}x{size}: {matched} пар, стоимость {total_cost:.0f}, "
+          f"{time.perf_counter() - start:.2f} с")
+
+    # Разреженный случай: у каждой работы несколько допустимых исполнителей
+    jobs, workers, degree = 5000, 5000, 5
+    G = nx.Graph()
+    for job in range(jobs):
+        for worker in rng.choice(workers, size=degree, replace=False).tolist():
+            G.add_edge(("job", job), ("worker", worker), weight=int(rng.integers(1, 1000)))
+    start = time.perf_counter()
+    _, matched, total_cost = shortest_path_assignment(G, [("job", job) for job in range(jobs)])
+    print(f"Последовательные кратчайшие пути, {G.number_of_edges()} рёбер: {matched} пар, "
+          f"стоимость {total_cost}, {time.perf_counter() - start:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import random
+import sys
+import time
+
+import networkx as nx
+
+from main import ford_fulkerson_bipartite_matching, kuhn_maximum_matching
+from matching import hopcroft_karp_matching
+
+
+# nx.maximum_flow и рекурсивный Кун медленные: запускаем их только на графах не больше этого числа рёбер
+FORD_FULKERSON_MAX_EDGES = 50000
+KUHN_MAX_EDGES = 50000
+
+
+def random_bipartite(left_count, right_count, edge_count, seed):
+    """
+    Случайный двудольный граф с долями ("u", i) и ("v", j).
+
+    Цепочка u0-v0-u1-v1-... делает граф связным, иначе nx.bipartite.sets
+    в исходных алгоритмах не может однозначно определить доли.
+    """
+    rng = random.Random(seed)
+    edges = set()
+    for i in range(min(left_count, right_count)):
+        edges.add((i, i))
+        if i + 1 < left_count:
+            edges.add((i + 1, i))
+    while len(edges) < edge_count:
+        edges.add((rng.randrange(left_count), rng.randrange(right_count)))
+
+    G = nx.Graph()
+    G.add_edges_from((("u", i), ("v", j)) for i, j in edges)
+    left = [("u", i) for i in range(left_count)]
+    return G, left
+
+
+GRAPHS = {
+    "random-300-3k": lambda: random_bipartite(300, 300, 3000, 5),
+    "random-5k-50k": lambda: random_bipartite(5000, 5000, 50000, 1),
+    "random-20k-100k": lambda: random_bipartite(20000, 25000, 100000, 2),
+    "random-100k-1M": lambda: random_bipartite(100000, 100000, 1000000, 3),
+    "random-300k-1M": lambda: random_bipartite(300000, 250000, 1000000, 4),
+}
+
+ALGORITHMS = {
+    "ford-fulkerson": lambda G, left: ford_fulkerson_bipartite_matching(G),
+    "kuhn": lambda G, left: kuhn_maximum_matching(G),
+    "hopcroft-karp": lambda G, left: hopcroft_karp_matching(G, left, warm_start=False),
+    "hopcroft-karp+ks": lambda G, left: hopcroft_karp_matching(G, left),
+}
+
+
+def benchmark_graph(name, algorithms=ALGORITHMS):
+    G, left = GRAPHS[name]()
+    edge_count = G.number_of_edges()
+    print(f"\n{name}: {G.number_of_nodes()} вершин, {edge_count} рёбер")
+
+    sizes = set()
+    for algorithm, run in algorithms.items():
+        if algorithm == "ford-fulkerson" and edge_count > FORD_FULKERSON_MAX_EDGES:
+            continue
+        if algorithm == "kuhn" and edge_count > KUHN_MAX_EDGES:
+            continue
+        start = time.perf_counter()
+        try:
+            _, size = run(G, left)
+        except RecursionError:
+            print(f"  {algorithm:<17} превышена глубина рекурсии")
+            continue
+        seconds = time.perf_counter() - start
+        sizes.add(size)
+        print(f"  {algorithm:<17} паросочетание {size:<8} {seconds:8.2f} с")
+
+    if len(sizes) > 1:
+        print(f"  Алгоритмы разошлись: {sorted(sizes)}")
+
+
+def main() -> None:
+    names = sys.argv[1:] or list(GRAPHS)
+    for name in names:
+        benchmark_graph(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
+import os
 import random
+import sys
 
 import numpy
-import matplotlib.pyplot as plt
 import networkx as nx
 
+# Общие для лабораторных модули лежат в пакете common в корне репозитория
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.graph_export import export_graph
+
 
 EDGES = [
     (4, 7), (5, 11), (3, 4), (11, 14), (8, 13), (7, 8),
@@ -145,6 +150,19 @@ def main() -> None:
     ford_fulkerson_bipartite_matching(G)
 
 
+    # Файл для картинки: если задан, граф сохраняется в него (.svg/.png/.dot/.graphml) вместо окна
+    if len(sys.argv) > 1:
+        export_graph(
+            G,
+            sys.argv[1],
+            node_colors={node: "red" if color_map[node] else "green" for node in G},
+            layout="layered",
+            layers=color_map,
+        )
+        return
+
+    import matplotlib.pyplot as plt
+
     node_color = ["red" if color_map[node] else "green" for node in G]
     nx.draw_networkx(G, node_color=node_color)
 
@@ -0,0 +1,222 @@
+import networkx as nx
+import numpy
+
+
+class BipartiteCSR:
+    """
+    Двудольный граф в массивах: вершины долей пронумерованы 0..L-1 и 0..R-1,
+    соседи левой вершины u — right_ids[offsets[u]:offsets[u + 1]].
+    Для эвристики Карпа — Сипсера хранится и общая смежность обеих долей
+    (правая вершина v имеет номер L + v). Веса рёбер, если заданы, лежат
+    в weights в том же порядке, что и neighbors.
+    """
+
+    def __init__(self, left_count, right_count, left_ids, right_ids, weights=None):
+        left_ids = numpy.asarray(left_ids, dtype=numpy.intp)
+        right_ids = numpy.asarray(right_ids, dtype=numpy.intp)
+        self.left_count = left_count
+        self.right_count = right_count
+
+        order = numpy.argsort(left_ids, kind="stable")
+        self.offsets = numpy.searchsorted(left_ids[order], numpy.arange(left_count + 1)).tolist()
+        self.neighbors = right_ids[order].tolist()
+        self.weights = [weights[index] for index in order.tolist()] if weights is not None else None
+
+        # Общая смежность: рёбра в обе стороны, отсортированные по началу
+        tails = numpy.concatenate((left_ids, right_ids + left_count))
+        heads = numpy.concatenate((right_ids + left_count, left_ids))
+        order = numpy.argsort(tails, kind="stable")
+        self.all_offsets = numpy.searchsorted(tails[order], numpy.arange(left_count + right_count + 1)).tolist()
+        self.all_neighbors = heads[order].tolist()
+
+        self.left_nodes = list(range(left_count))
+        self.right_nodes = list(range(right_count))
+
+    @classmethod
+    def from_networkx(cls, G, left=None, weight=None):
+        """
+        Строим по nx.Graph; left — вершины левой доли (по умолчанию из nx.bipartite.sets),
+        weight — имя атрибута ребра с весом (None — без весов).
+        """
+        if left is None:
+            left, _ = nx.bipartite.sets(G)
+        left = set(left)
+        left_nodes = [node for node in G.nodes if node in left]
+        right_nodes = [node for node in G.nodes if node not in left]
+        left_index = {node: number for number, node in enumerate(left_nodes)}
+        right_index = {node: number for number, node in enumerate(right_nodes)}
+
+        left_ids = []
+        right_ids = []
+        weights = []
+        for a, b, value in G.edges(data=weight):
+            if a in left_index and b in right_index:
+                left_ids.append(left_index[a])
+                right_ids.append(right_index[b])
+            elif b in left_index and a in right_index:
+                left_ids.append(left_index[b])
+                right_ids.append(right_index[a])
+            else:
+                continue
+            weights.append(value)
+
+        graph = cls(len(left_nodes), len(right_nodes), left_ids, right_ids, weights if weight is not None else None)
+        graph.left_nodes = left_nodes
+        graph.right_nodes = right_nodes
+        return graph
+
+
+def karp_sipser(graph):
+    """
+    Начальное паросочетание эвристикой Карпа — Сипсера.
+
+    Пока есть вершина с одним свободным соседом, она сочетается с ним (такое
+    ребро входит в некоторое наибольшее паросочетание); иначе берётся любое
+    свободное ребро. Степени пересчитываются при каждом сочетании, всего O(E).
+    Возвращает (match_left, match_right), -1 — вершина свободна.
+    """
+    left_count = graph.left_count
+    offsets = graph.all_offsets
+    neighbors = graph.all_neighbors
+    vertex_count = len(offsets) - 1
+
+    mate = [-1] * vertex_count
+    degree = [offsets[x + 1] - offsets[x] for x in range(vertex_count)]
+    single = [x for x in range(vertex_count) if degree[x] == 1]
+
+    def free_neighbor(x):
+        for index in range(offsets[x], offsets[x + 1]):
+            if mate[neighbors[index]] == -1:
+                return neighbors[index]
+        return -1
+
+    def match(a, b):
+        mate[a] = b
+        mate[b] = a
+        for y in (a, b):
+            for index in range(offsets[y], offsets[y + 1]):
+                z = neighbors[index]
+                if mate[z] == -1:
+                    degree[z] -= 1
+                    if degree[z] == 1:
+                        single.append(z)
+
+    next_vertex = 0
+    while True:
+        while single:
+            x = single.pop()
+            if mate[x] == -1 and degree[x] == 1:
+                y = free_neighbor(x)
+                if y != -1:
+                    match(x, y)
+
+        while next_vertex < left_count and (mate[next_vertex] != -1 or degree[next_vertex] == 0):
+            next_vertex += 1
+        if next_vertex == left_count:
+            break
+        y = free_neighbor(next_vertex)
+        if y == -1:
+            degree[next_vertex] = 0
+            continue
+        match(next_vertex, y)
+
+    match_left = [mate[u] - left_count if mate[u] != -1 else -1 for u in range(left_count)]
+    match_right = [mate[left_count + v] for v in range(graph.right_count)]
+    return match_left, match_right
+
+
+def hopcroft_karp(graph, match_left=None, match_right=None):
+    """
+    Алгоритм Хопкрофта — Карпа, O(E * sqrt(V)).
+
+    Каждая фаза: поиск в ширину от свободных левых вершин строит слои до
+    первого слоя со свободной правой вершиной, затем итеративный поиск в
+    глубину (без рекурсии, с указателями на текущее ребро) находит
+    максимальный набор непересекающихся кратчайших увеличивающих путей. Можно передать начальное паросочетание.
+    Возвращает (match_left, match_right).
+    """
+    left_count = graph.left_count
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    match_left = list(match_left) if match_left is not None else [-1] * left_count
+    match_right = list(match_right) if match_right is not None else [-1] * graph.right_count
+    unreachable = left_count + 1
+
+    while True:
+        # Слои: расстояние от свободных левых вершин по чередующимся путям
+        dist = [unreachable] * left_count
+        queue = [u for u in range(left_count) if match_left[u] == -1]
+        for u in queue:
+            dist[u] = 0
+        # Слой, на котором впервые встретилась свободная правая вершина: длина кратчайших путей
+        free_layer = unreachable
+        head = 0
+        while head < len(queue):
+            u = queue[head]
+            head += 1
+            next_dist = dist[u] + 1
+            if next_dist > free_layer:
+                break
+            for index in range(offsets[u], offsets[u + 1]):
+                w = match_right[neighbors[index]]
+                if w == -1:
+                    free_layer = next_dist
+                elif dist[w] == unreachable:
+                    dist[w] = next_dist
+                    queue.append(w)
+        if free_layer == unreachable:
+            return match_left, match_right
+
+        current = offsets[:-1]
+        for root in range(left_count):
+            if match_left[root] != -1:
+                continue
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                end = offsets[u + 1]
+                next_dist = dist[u] + 1
+                while current[u] < end:
+                    w = match_right[neighbors[current[u]]]
+                    # Свободная вершина подходит только на слое free_layer, занятая — только до него
+                    if (w == -1 and next_dist == free_layer) or (w != -1 and dist[w] == next_dist < free_layer):
+                        break
+                    current[u] += 1
+
+                if current[u] == end:
+                    # Тупик: вершина больше не участвует в этой фазе
+                    dist[u] = unreachable
+                    stack.pop()
+                    if stack:
+                        current[stack[-1]] += 1
+                    continue
+
+                w = match_right[neighbors[current[u]]]
+                if w != -1:
+                    stack.append(w)
+                    continue
+
+                # Свободная правая вершина: переворачиваем путь вдоль стека
+                for x in stack:
+                    v = neighbors[current[x]]
+                    match_left[x] = v
+                    match_right[v] = x
+                break
+
+
+def hopcroft_karp_matching(G, left=None, warm_start=True):
+    """
+    Наибольшее паросочетание двудольного графа G алгоритмом Хопкрофта — Карпа.
+
+    Возвращает (matching_edges, size), как kuhn_maximum_matching; рёбра — (u, v), u из левой доли.
+    """
+    graph = BipartiteCSR.from_networkx(G, left)
+    match_left, match_right = karp_sipser(graph) if warm_start else (None, None)
+    match_left, _ = hopcroft_karp(graph, match_left, match_right)
+
+    matching_edges = [
+        (graph.left_nodes[u], graph.right_nodes[v])
+        for u, v in enumerate(match_left)
+        if v != -1
+    ]
+    return matching_edges, len(matching_edges)
@@ -0,0 +1,63 @@
+import itertools
+import random
+
+import networkx as nx
+import numpy
+import pytest
+
+from assignment import hungarian_assignment, shortest_path_assignment
+
+
+def _brute_force(cost):
+    rows, columns = cost.shape
+    if rows > columns:
+        return _brute_force(cost.T)
+    return min(
+        sum(cost[row, column] for row, column in enumerate(permutation))
+        for permutation in itertools.permutations(range(columns), rows)
+    )
+
+
+def test_dense_assignment_matches_brute_force():
+    rng = numpy.random.default_rng(0)
+    for _ in range(100):
+        rows, columns = rng.integers(1, 6, 2)
+        cost = rng.integers(-50, 100, (rows, columns)).astype(float)
+
+        _, size, total_cost = hungarian_assignment(cost)
+        assert size == min(rows, columns)
+        assert total_cost == pytest.approx(_brute_force(cost))
+
+        G = nx.Graph()
+        for row in range(rows):
+            for column in range(columns):
+                G.add_edge(("job", row), ("worker", column), weight=int(cost[row, column]))
+        _, sparse_size, sparse_cost = shortest_path_assignment(G, [("job", row) for row in range(rows)])
+        assert (sparse_size, sparse_cost) == (size, total_cost)
+
+
+@pytest.mark.parametrize("integer_weights", [True, False])
+def test_sparse_assignment_is_maximum_and_cheapest(integer_weights):
+    rng = random.Random(1)
+    for _ in range(300):
+        G = nx.Graph()
+        left_count, right_count = rng.randint(1, 12), rng.randint(1, 12)
+        density = rng.choice([0.15, 0.3, 0.6])
+        for u in range(left_count):
+            for v in range(right_count):
+                if rng.random() < density:
+                    weight = rng.randint(-20, 50) if integer_weights else rng.uniform(-2, 5)
+                    G.add_edge(("job", u), ("worker", v), weight=weight)
+        left = [node for node in G if node[0] == "job"]
+        if not left:
+            continue
+
+        edges, size, total_cost = shortest_path_assignment(G, left)
+        # Наибольшее паросочетание минимальной стоимости — это max_weight_matching с большим сдвигом весов
+        shifted = nx.Graph([(u, v, {"weight": 10 ** 6 - data["weight"]}) for u, v, data in G.edges(data=True)])
+        reference = nx.max_weight_matching(shifted, maxcardinality=True)
+
+        assert size == len(reference)
+        assert total_cost == pytest.approx(sum(G[u][v]["weight"] for u, v in reference))
+        assert all(G.has_edge(u, v) for u, v in edges)
+        assert len({v for _, v in edges}) == size
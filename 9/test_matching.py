@@ -0,0 +1,33 @@
+import random
+
+import networkx as nx
+import pytest
+
+from matching import BipartiteCSR, hopcroft_karp, hopcroft_karp_matching, karp_sipser
+
+
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_hopcroft_karp_matches_networkx(warm_start):
+    rng = random.Random(3)
+    for _ in range(200):
+        left_count, right_count = rng.randint(1, 30), rng.randint(1, 30)
+        edges = {(rng.randrange(left_count), rng.randrange(right_count)) for _ in range(rng.randint(0, 80))}
+        graph = BipartiteCSR(left_count, right_count, [u for u, _ in edges], [v for _, v in edges])
+        G = nx.Graph()
+        G.add_nodes_from(range(left_count + right_count))
+        G.add_edges_from((u, left_count + v) for u, v in edges)
+        expected = len(nx.bipartite.maximum_matching(G, top_nodes=range(left_count))) // 2
+
+        match_left, match_right = hopcroft_karp(graph, *(karp_sipser(graph) if warm_start else (None, None)))
+        pairs = [(u, v) for u, v in enumerate(match_left) if v != -1]
+
+        assert len(pairs) == expected
+        assert all((u, v) in edges and match_right[v] == u for u, v in pairs)
+
+
+def test_hopcroft_karp_matching_on_names():
+    G = nx.Graph([("a", 1), ("a", 2), ("b", 1)])
+    edges, size = hopcroft_karp_matching(G, ["a", "b"])
+
+    assert size == 2
+    assert sorted(edges) == [("a", 2), ("b", 1)]
@@ -0,0 +1,465 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict, deque
+from html import escape
+
+import networkx as nx
+import numpy
+
+
+# Сколько укладок держим в памяти
+LAYOUT_CACHE_SIZE = 32
+# Подписи вершин и рёбер выводим только на небольших графах
+MAX_LABELED_NODES = 300
+
+_LAYOUT_CACHE = OrderedDict()
+
+
+def graph_key(G):
+    """Ключ структуры графа: направленность, вершины и рёбра (без атрибутов)."""
+    digest = hashlib.sha256()
+    digest.update(b"directed" if G.is_directed() else b"undirected")
+    for node in sorted(map(repr, G.nodes)):
+        digest.update(node.encode())
+        digest.update(b"\0")
+    edges = G.edges if G.is_directed() else (tuple(sorted((u, v), key=repr)) for u, v in G.edges)
+    for edge in sorted(map(repr, edges)):
+        digest.update(edge.encode())
+        digest.update(b"\1")
+    return digest.hexdigest()
+
+
+def layered_layout(G, layers):
+    """
+    Укладка по слоям: x — номер слоя, y — порядок в слое.
+
+    Порядок в слое — по среднему положению соседей из предыдущего слоя
+    (один проход барицентрического метода), что уменьшает пересечения.
+    """
+    by_layer = {}
+    for node in G.nodes:
+        by_layer.setdefault(layers[node], []).append(node)
+
+    order = {}
+    pos = {}
+    for layer in sorted(by_layer):
+        nodes = by_layer[layer]
+
+        def barycenter(node):
+            neighbors = G.predecessors(node) if G.is_directed() else G.neighbors(node)
+            placed = [order[other] for other in neighbors if other in order and layers[other] < layer]
+            return sum(placed) / len(placed) if placed else 0.0
+
+        nodes.sort(key=lambda node: (barycenter(node), repr(node)))
+        for number, node in enumerate(nodes):
+            order[node] = number / max(len(nodes) - 1, 1)
+            pos[node] = (float(layer), order[node])
+    return pos
+
+
+def st_layers(G, source):
+    """Слои сети s–t: расстояние от истока поиском в ширину; недостижимые — в последний слой."""
+    layers = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        neighbors = G.successors(node) if G.is_directed() else G.neighbors(node)
+        for other in neighbors:
+            if other not in layers:
+                layers[other] = layers[node] + 1
+                queue.append(other)
+    last = max(layers.values()) + 1
+    return {node: layers.get(node, last) for node in G.nodes}
+
+
+def force_layout(G, iterations=50, seed=0, theta=1.0, depth=None, chunk=4096):
+    """
+    Силовая укладка (Фрухтерман — Рейнгольд) с отталкиванием по Барнсу — Хату.
+
+    На каждом шаге строится квадродерево (_quadtree). Вершина отталкивается от
+    центра масс клетки целиком, если сторона клетки меньше theta * расстояние
+    до центра и вершина не лежит в этой клетке; иначе клетка раскрывается на
+    детей. В листьях дерева отталкивание считается точно от каждой вершины,
+    кроме самой себя. Шаг стоит O(V log V + E) при фиксированном theta.
+    Обход идёт по уровням дерева сразу для пачки из chunk вершин, притяжение
+    считается по рёбрам массивами.
+    """
+    nodes = list(G.nodes)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    index = {node: number for number, node in enumerate(nodes)}
+    edges = numpy.array([(index[u], index[v]) for u, v in G.edges if u != v], dtype=numpy.intp).reshape(-1, 2)
+    if depth is None:
+        # В среднем в листе около одной вершины
+        depth = min(max(int(numpy.ceil(numpy.log2(n) / 2)), 1), 16)
+
+    rng = numpy.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    k = numpy.sqrt(1.0 / n)
+    softening = (0.01 * k) ** 2
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        tree = _quadtree(pos, depth)
+        displacement = numpy.zeros_like(pos)
+        for start in range(0, n, chunk):
+            _repulsion(pos, tree, numpy.arange(start, min(start + chunk, n)), theta, softening, displacement)
+        displacement *= k * k
+
+        if len(edges):
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            distance = numpy.sqrt((delta ** 2).sum(axis=1))[:, None]
+            force = delta * distance / k
+            numpy.add.at(displacement, edges[:, 0], -force)
+            numpy.add.at(displacement, edges[:, 1], force)
+
+        length = numpy.maximum(numpy.sqrt((displacement ** 2).sum(axis=1)), 1e-12)[:, None]
+        pos += displacement / length * numpy.minimum(length, temperature)
+        temperature -= cooling
+
+    return {node: (float(x), float(y)) for node, (x, y) in zip(nodes, pos)}
+
+
+class _QuadTree:
+    """
+    Квадродерево глубины depth в массивах, уровень l — сетка 2^l x 2^l.
+
+    Для уровня l: cell_of[l][i] — клетка вершины i, mass[l] и centers[l] —
+    число вершин и центр масс занятых клеток, children[l] — начало и число
+    детей клетки на уровне l + 1, sizes[l] — сторона клетки. Вершины листа c
+    — points[leaf_start[c]:leaf_start[c] + mass[depth][c]].
+    """
+
+    def __init__(self, cell_of, mass, centers, children, sizes, points, leaf_start):
+        self.cell_of = cell_of
+        self.mass = mass
+        self.centers = centers
+        self.children = children
+        self.sizes = sizes
+        self.points = points
+        self.leaf_start = leaf_start
+
+
+def _quadtree(pos, depth):
+    """Строим квадродерево по кодам Мортона: клетки уровня l — коды, сдвинутые на 2 * (depth - l) бит."""
+    low = pos.min(axis=0)
+    span = max(float((pos.max(axis=0) - low).max()), 1e-9)
+    side = 1 << depth
+    cells = numpy.clip(((pos - low) / span * side).astype(numpy.int64), 0, side - 1)
+    morton = _spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << 1)
+
+    cell_of, mass, centers, keys = [], [], [], []
+    for level in range(depth + 1):
+        level_keys, inverse = numpy.unique(morton >> (2 * (depth - level)), return_inverse=True)
+        counts = numpy.bincount(inverse)
+        cell_of.append(inverse)
+        mass.append(counts.astype(float))
+        centers.append(numpy.stack(
+            [numpy.bincount(inverse, weights=pos[:, axis]) / counts for axis in range(2)], axis=1,
+        ))
+        keys.append(level_keys)
+
+    children = []
+    for level in range(depth):
+        parents = keys[level + 1] >> 2
+        first = numpy.searchsorted(parents, keys[level], side="left")
+        children.append((first, numpy.searchsorted(parents, keys[level], side="right") - first))
+
+    points = numpy.argsort(cell_of[depth], kind="stable")
+    leaf_start = numpy.concatenate(([0], numpy.cumsum(mass[depth][:-1]))).astype(numpy.intp)
+    sizes = [span / (1 << level) for level in range(depth + 1)]
+    return _QuadTree(cell_of, mass, centers, children, sizes, points, leaf_start)
+
+
+def _repulsion(pos, tree, batch, theta, softening, displacement):
+    """Прибавляем к displacement отталкивание вершин batch, обходя дерево по уровням."""
+    n = len(pos)
+    vertices = batch
+    cells = numpy.zeros(len(batch), dtype=numpy.intp)
+    depth = len(tree.sizes) - 1
+    for level in range(depth + 1):
+        delta = pos[vertices] - tree.centers[level][cells]
+        distance2 = (delta ** 2).sum(axis=1) + softening
+        far = (tree.sizes[level] ** 2 < theta * theta * distance2) & (tree.cell_of[level][vertices] != cells)
+        _accumulate(displacement, vertices[far], delta[far], tree.mass[level][cells[far]] / distance2[far], n)
+
+        vertices, cells = vertices[~far], cells[~far]
+        if level < depth:
+            first, counts = tree.children[level]
+            counts = counts[cells]
+            vertices = numpy.repeat(vertices, counts)
+            cells = _ranges(first[cells], counts)
+
+    # Листья: точное отталкивание от каждой вершины клетки, кроме самой себя
+    counts = tree.mass[depth][cells].astype(numpy.intp)
+    vertices = numpy.repeat(vertices, counts)
+    others = tree.points[_ranges(tree.leaf_start[cells], counts)]
+    distinct = others != vertices
+    vertices, others = vertices[distinct], others[distinct]
+    delta = pos[vertices] - pos[others]
+    _accumulate(displacement, vertices, delta, 1.0 / ((delta ** 2).sum(axis=1) + softening), n)
+
+
+def _accumulate(displacement, vertices, delta, scale, n):
+    for axis in range(2):
+        displacement[:, axis] += numpy.bincount(vertices, weights=delta[:, axis] * scale, minlength=n)
+
+
+def _spread_bits(values):
+    """Раздвигаем 16 младших бит через один: бит i переходит в бит 2i (для кода Мортона)."""
+    values = values & 0xFFFF
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    return (values | (values << 1)) & 0x55555555
+
+
+def _ranges(starts, counts):
+    """Конкатенация диапазонов starts[i] .. starts[i] + counts[i] - 1."""
+    total = int(counts.sum())
+    if total == 0:
+        return numpy.zeros(0, dtype=numpy.intp)
+    ends = numpy.cumsum(counts)
+    steps = numpy.ones(total, dtype=numpy.intp)
+    present = counts > 0
+    heads = (ends - counts)[present]
+    firsts = starts[present]
+    steps[heads[0]] = firsts[0]
+    # Скачок от конца предыдущего непустого диапазона к началу следующего
+    previous_last = (firsts + counts[present] - 1)[:-1]
+    steps[heads[1:]] = firsts[1:] - previous_last
+    return numpy.cumsum(steps)
+
+
+def cached_layout(G, kind="force", source=None, layers=None, seed=0, cache_dir=None):
+    """
+    Укладка графа с кэшем по структуре графа (в памяти и, если задан cache_dir, на диске).
+
+    kind: "force" — силовая укладка, "layered" — по слоям layers или, если они
+    не заданы, по расстоянию от source.
+    """
+    if kind == "layered" and layers is None:
+        layers = st_layers(G, source)
+    params = repr((kind, seed, sorted((repr(node), layer) for node, layer in layers.items()) if layers else None))
+    key = f"{graph_key(G)}-{hashlib.sha256(params.encode()).hexdigest()[:16]}"
+
+    if key in _LAYOUT_CACHE:
+        _LAYOUT_CACHE.move_to_end(key)
+        return _LAYOUT_CACHE[key]
+
+    pos = None
+    path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as fp:
+            stored = json.load(fp)
+        by_repr = {repr(node): node for node in G.nodes}
+        pos = {by_repr[name]: (x, y) for name, x, y in stored}
+
+    if pos is None:
+        if kind == "layered":
+            pos = layered_layout(G, layers)
+        elif kind == "force":
+            pos = force_layout(G, seed=seed)
+        else:
+            raise ValueError(f"Неизвестная укладка: {kind}")
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as fp:
+                json.dump([[repr(node), x, y] for node, (x, y) in pos.items()], fp)
+
+    _LAYOUT_CACHE[key] = pos
+    if len(_LAYOUT_CACHE) > LAYOUT_CACHE_SIZE:
+        _LAYOUT_CACHE.popitem(last=False)
+    return pos
+
+
+def _by_edge(G, mapping):
+    """
+    Значения mapping для рёбер в том порядке концов, в каком их выдаёт G.edges.
+
+    У неориентированного графа ребро можно задать и как (u, v), и как (v, u).
+    """
+    mapping = mapping or {}
+    if G.is_directed():
+        return mapping
+    oriented = {}
+    for u, v in G.edges:
+        if (u, v) in mapping:
+            oriented[u, v] = mapping[u, v]
+        elif (v, u) in mapping:
+            oriented[u, v] = mapping[v, u]
+    return oriented
+
+
+def write_svg(G, pos, path, node_colors=None, edge_colors=None, edge_labels=None, title=None, size=1000):
+    """Рисуем граф в SVG без matplotlib: линии, стрелки для орграфа, вершины-кружки и подписи."""
+    node_colors = node_colors or {}
+    edge_colors = _by_edge(G, edge_colors)
+    edge_labels = _by_edge(G, edge_labels)
+    coordinates = numpy.array([pos[node] for node in G.nodes], dtype=float).reshape(-1, 2)
+    low = coordinates.min(axis=0) if len(coordinates) else numpy.zeros(2)
+    span = numpy.maximum(coordinates.max(axis=0) - low, 1e-9) if len(coordinates) else numpy.ones(2)
+    margin = 40
+    scale = (size - 2 * margin) / span
+    points = {
+        node: (margin + (x - low[0]) * scale[0], size - margin - (y - low[1]) * scale[1])
+        for node, (x, y) in zip(G.nodes, coordinates.tolist())
+    }
+    labeled = G.number_of_nodes() <= MAX_LABELED_NODES
+    radius = 12 if labeled else 2
+
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="6" markerHeight="6" '
+        'orient="auto-start-reverse"><path d="M 0 0 L 10 5 L 0 10 z"/></marker></defs>',
+        '<rect width="100%" height="100%" fill="white"/>',
+    ]
+    if title:
+        lines.append(f'<text x="{size / 2}" y="24" text-anchor="middle" font-size="18">{escape(str(title))}</text>')
+
+    marker = ' marker-end="url(#arrow)"' if G.is_directed() else ""
+    for u, v in G.edges:
+        (x1, y1), (x2, y2) = points[u], points[v]
+        # Стрелка заканчивается на границе кружка
+        length = max(((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5, 1e-9)
+        x2, y2 = x2 - (x2 - x1) * radius / length, y2 - (y2 - y1) * radius / length
+        color = edge_colors.get((u, v), "black")
+        lines.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" stroke="{color}"{marker}/>')
+        if labeled and edge_labels and (u, v) in edge_labels:
+            lines.append(
+                f'<text x="{(x1 + x2) / 2:.1f}" y="{(y1 + y2) / 2:.1f}" font-size="11" fill="blue" '
+                f'text-anchor="middle">{escape(str(edge_labels[u, v]))}</text>'
+            )
+
+    for node in G.nodes:
+        x, y = points[node]
+        color = node_colors.get(node, "lightblue")
+        lines.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius}" fill="{color}" stroke="black"/>')
+        if labeled:
+            lines.append(
+                f'<text x="{x:.1f}" y="{y + 4:.1f}" font-size="11" text-anchor="middle">{escape(str(node))}</text>'
+            )
+
+    lines.append("</svg>")
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("\n".join(lines))
+
+
+def write_png(G, pos, path, node_colors=None, edge_colors=None, edge_labels=None, title=None, size=10):
+    """Рисуем граф в PNG через matplotlib с бэкендом Agg (без дисплея); matplotlib нужен только здесь."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    node_colors = node_colors or {}
+    edge_colors = _by_edge(G, edge_colors)
+    edge_labels = _by_edge(G, edge_labels)
+    figure, axes = plt.subplots(figsize=(size, size))
+    segments = [(pos[u], pos[v]) for u, v in G.edges]
+    axes.add_collection(LineCollection(
+        segments, colors=[edge_colors.get(edge, "black") for edge in G.edges], linewidths=0.5,
+    ))
+    coordinates = numpy.array([pos[node] for node in G.nodes], dtype=float).reshape(-1, 2)
+    axes.scatter(
+        coordinates[:, 0], coordinates[:, 1],
+        c=[node_colors.get(node, "lightblue") for node in G.nodes],
+        s=200 if G.number_of_nodes() <= MAX_LABELED_NODES else 2, edgecolors="black", zorder=2,
+    )
+    if G.number_of_nodes() <= MAX_LABELED_NODES:
+        for node, (x, y) in zip(G.nodes, coordinates.tolist()):
+            axes.annotate(str(node), (x, y), ha="center", va="center", fontsize=8, zorder=3)
+        for (u, v), label in edge_labels.items():
+            (x1, y1), (x2, y2) = pos[u], pos[v]
+            axes.annotate(str(label), ((x1 + x2) / 2, (y1 + y2) / 2), color="blue", fontsize=7)
+    if title:
+        axes.set_title(str(title))
+    axes.autoscale()
+    axes.set_axis_off()
+    figure.savefig(path, dpi=100)
+    plt.close(figure)
+
+
+def write_dot(G, path, pos=None, node_colors=None, edge_colors=None, edge_labels=None):
+    """Записываем граф в формате Graphviz DOT (координаты — в атрибуте pos)."""
+    node_colors = node_colors or {}
+    edge_colors = _by_edge(G, edge_colors)
+    edge_labels = _by_edge(G, edge_labels)
+
+    def quote(value):
+        return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    arrow = "->" if G.is_directed() else "--"
+    lines = [f"{'digraph' if G.is_directed() else 'graph'} G {{"]
+    for node in G.nodes:
+        attributes = []
+        if node in node_colors:
+            attributes.append(f"style=filled, fillcolor={quote(node_colors[node])}")
+        if pos is not None:
+            x, y = pos[node]
+            attributes.append(f'pos="{x:.4f},{y:.4f}!"')
+        lines.append(f"  {quote(node)}" + (f" [{', '.join(attributes)}]" if attributes else "") + ";")
+    for u, v in G.edges:
+        attributes = []
+        if (u, v) in edge_colors:
+            attributes.append(f"color={quote(edge_colors[u, v])}")
+        if (u, v) in edge_labels:
+            attributes.append(f"label={quote(edge_labels[u, v])}")
+        lines.append(f"  {quote(u)} {arrow} {quote(v)}" + (f" [{', '.join(attributes)}]" if attributes else "") + ";")
+    lines.append("}")
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("\n".join(lines))
+
+
+def write_graphml(G, path, pos=None, node_colors=None, edge_colors=None):
+    """Записываем граф в GraphML: имена вершин — строки, координаты и цвета — атрибуты."""
+    node_colors = node_colors or {}
+    edge_colors = _by_edge(G, edge_colors)
+    export = nx.DiGraph() if G.is_directed() else nx.Graph()
+    for node, data in G.nodes(data=True):
+        attributes = {key: value for key, value in data.items() if isinstance(value, (str, int, float, bool))}
+        if pos is not None:
+            attributes["x"], attributes["y"] = pos[node]
+        if node in node_colors:
+            attributes["color"] = node_colors[node]
+        export.add_node(str(node), **attributes)
+    for u, v, data in G.edges(data=True):
+        attributes = {key: value for key, value in data.items() if isinstance(value, (str, int, float, bool))}
+        if (u, v) in edge_colors:
+            attributes["color"] = edge_colors[u, v]
+        export.add_edge(str(u), str(v), **attributes)
+    nx.write_graphml(export, path)
+
+
+WRITERS = {
+    ".svg": write_svg,
+    ".png": write_png,
+    ".dot": write_dot,
+    ".gv": write_dot,
+    ".graphml": write_graphml,
+}
+
+
+def export_graph(G, path, pos=None, node_colors=None, edge_colors=None, edge_labels=None, title=None,
+                 layout="force", source=None, layers=None, cache_dir=None):
+    """
+    Сохраняем граф в файл; формат — по расширению path (.svg, .png, .dot/.gv, .graphml).
+
+    Если pos не задан, укладка берётся из cached_layout(layout, source, layers).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Неизвестный формат: {extension}")
+    if pos is None:
+        pos = cached_layout(G, layout, source=source, layers=layers, cache_dir=cache_dir)
+
+    if extension in (".svg", ".png"):
+        WRITERS[extension](G, pos, path, node_colors, edge_colors, edge_labels, title)
+    elif extension == ".graphml":
+        write_graphml(G, path, pos, node_colors, edge_colors)
+    else:
+        write_dot(G, path, pos, node_colors, edge_colors, edge_labels)
@@ -0,0 +1,26 @@
+import networkx as nx
+import pytest
+
+from common.graph_export import export_graph
+
+
+@pytest.mark.parametrize("extension", [".svg", ".dot", ".graphml"])
+def test_undirected_edge_keys_in_either_order(tmp_path, extension):
+    G = nx.Graph([(1, 2), (2, 3)])
+    path = tmp_path / f"graph{extension}"
+    # Рёбра заданы в порядке, обратном G.edges
+    export_graph(G, str(path), edge_colors={(2, 1): "red", (3, 2): "green"},
+                 edge_labels={(2, 1): "a", (3, 2): "b"}, layout="layered", source=1)
+
+    text = path.read_text(encoding="utf-8")
+    assert "red" in text and "green" in text
+    if extension != ".graphml":
+        assert ">a<" in text or 'label="a"' in text
+
+
+def test_directed_edge_keys_keep_orientation(tmp_path):
+    G = nx.DiGraph([(1, 2)])
+    path = tmp_path / "graph.dot"
+    export_graph(G, str(path), edge_colors={(2, 1): "red"}, layout="layered", source=1)
+
+    assert "red" not in path.read_text(encoding="utf-8")